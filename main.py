@@ -1,15 +1,32 @@
+import argparse
 import asyncio
 
-from src.dexscreener_bot import DexScreenerBot
+from src.chain_coordinator import ChainCoordinator
 
 
 async def main():
-    bot = DexScreenerBot("config.json")
-    try:
-        await bot.run()
-    except KeyboardInterrupt:
-        await bot.stop()
+    parser = argparse.ArgumentParser(description="DexScreener sniper bot")
+    parser.add_argument("--config", default="config.json", help="Configuration file")
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single cycle, print its timings and exit"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Do not log into Telegram, record intended trades instead of sending them",
+    )
+    args = parser.parse_args()
+
+    coordinator = ChainCoordinator(args.config, dry_run=args.dry_run)
+    if not args.once:
+        await coordinator.run()
+        return
+
+    for stats in (await coordinator.run_once()).values():
+        if stats:
+            print(stats.summary())
+            for trade in stats.intended_trades:
+                print(f"  would {trade['action']} {trade['token']} {trade['amount']}")
 
 if __name__ == "__main__":
     asyncio.run(main())
-    bot = DexScreenerBot()
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+# Measure the import time of the bot module with `python -X importtime` and
+# fail when it exceeds the budget or pulls in a module that should be lazy.
+#
+#   python scripts/check_import_time.py [budget_ms]
+
+MODULE = "src.dexscreener_bot"
+LAZY_MODULES = ["telegram", "telethon", "solana", "solders", "requests"]
+DEFAULT_BUDGET_MS = 400
+
+
+def measure(module: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative.strip())
+    return timings
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    timings = measure(MODULE)
+
+    total_ms = timings[MODULE] / 1000
+    eager = [name for name in LAZY_MODULES if name in timings]
+
+    print(f"{MODULE}: {total_ms:.1f}ms (budget {budget_ms:.0f}ms)")
+    for name, us in sorted(timings.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    if eager:
+        print(f"FAIL: eagerly imported {', '.join(eager)}")
+        sys.exit(1)
+    if total_ms > budget_ms:
+        print("FAIL: import time budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
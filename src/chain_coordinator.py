@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import signal
+from typing import Dict, List, Optional
+
+from .database import Database
+from .dexscreener_bot import DexScreenerBot, setup_logging
+from .models.cycle_stats import CycleStats
+
+
+def enabled_chains(config: Dict) -> List[str]:
+    """List the chains that get a pipeline, Solana only when none are configured"""
+    chains = config.get("chains") or {"solana": {}}
+    return [chain for chain, settings in chains.items() if settings.get("enabled", True)]
+
+
+def merge_reports(reports: Dict[str, Dict]) -> Dict:
+    """Merge per-chain analysis reports into a single report"""
+    merged = {
+        "total_tokens": 0,
+        "status_counts": {},
+        "fake_volume_detected": 0,
+        "bundled_supply_count": 0,
+        "chains": {},
+    }
+    for chain, report in reports.items():
+        merged["total_tokens"] += report["total_tokens"]
+        merged["fake_volume_detected"] += report["fake_volume_detected"]
+        merged["bundled_supply_count"] += report["bundled_supply_count"]
+        for status, count in report["status_counts"].items():
+            merged["status_counts"][status] = merged["status_counts"].get(status, 0) + count
+        merged["chains"][chain] = report["total_tokens"]
+    return merged
+
+
+def run_chain_pipeline(config_path: str, chain_id: str, dry_run: bool = False):
+    """Worker process entry point running the pipeline of a single chain"""
+    # Replaces the handler on the coordinator log, opened by the module import
+    setup_logging(f"dexscreener_bot_{chain_id}.log", force=True)
+    bot = DexScreenerBot(config_path, chain_id, dry_run=dry_run)
+    bot.send_reports = False
+    asyncio.run(bot.run())
+
+
+class ChainCoordinator:
+    """Run one pipeline per enabled chain and merge their reports"""
+
+    def __init__(self, config_path: str = "config.json", dry_run: bool = False):
+        self.config_path = config_path
+        self.dry_run = dry_run
+        with open(config_path, "r") as f:
+            self.config = json.load(f)
+        self.chains = enabled_chains(self.config)
+
+        settings = self.config.get("chain_workers", {})
+        self.use_processes = settings.get("use_processes", True)
+        self.report_interval = settings.get("report_interval", 600)
+        self.running = False
+
+    async def run(self):
+        """Run every chain pipeline until they all stop"""
+        if len(self.chains) == 1:
+            # A single pipeline keeps the plain bot behaviour, reports included
+            await DexScreenerBot(self.config_path, self.chains[0], dry_run=self.dry_run).run()
+            return
+
+        self.running = True
+        reporter = asyncio.create_task(self.__report_loop())
+        try:
+            if self.use_processes:
+                await self.__run_processes()
+            else:
+                await self.__run_in_process()
+        finally:
+            self.running = False
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+            await self.send_report()
+
+    async def run_once(self) -> Dict[str, Optional[CycleStats]]:
+        """Run a single cycle of every chain pipeline and return their stats"""
+        bots = [
+            DexScreenerBot(self.config_path, chain, dry_run=self.dry_run) for chain in self.chains
+        ]
+        for bot in bots:
+            bot.send_reports = len(bots) == 1
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, lambda: [bot.request_stop() for bot in bots])
+        try:
+            stats = await asyncio.gather(
+                *[bot.run_once(install_signal_handlers=False) for bot in bots]
+            )
+        finally:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+        if len(bots) > 1:
+            await self.send_report()
+        return dict(zip(self.chains, stats))
+
+    def merged_report(self) -> Dict:
+        """Merge the reports of every chain database shard"""
+        chain_settings = self.config.get("chains", {})
+        reports = {}
+        for chain in self.chains:
+            db_path = chain_settings.get(chain, {}).get("db_path", Database.shard_path(chain))
+            reports[chain] = Database(db_path).generate_report()
+        return merge_reports(reports)
+
+    async def send_report(self):
+        """Send the merged report through the Telegram notifier"""
+        report = self.merged_report()
+        report["blacklisted"] = len(self.config.get("blacklisted_coins", []))
+        if self.dry_run:
+            logging.info(f"[dry-run] Analysis Report: {json.dumps(report, indent=2)}")
+            return
+
+        from telegram import Bot
+        from telegram.error import TelegramError
+
+        settings = self.config["telegram_settings"]
+        try:
+            await Bot(settings["telegram_bot_token"]).send_message(
+                chat_id=settings["telegram_chat_id"],
+                text=f"Analysis Report: {json.dumps(report, indent=2)}",
+            )
+        except TelegramError as e:
+            logging.error(f"Telegram notification error: {e}")
+
+    async def __report_loop(self):
+        while self.running:
+            await asyncio.sleep(self.report_interval)
+            await self.send_report()
+
+    async def __run_processes(self):
+        """Run each chain in its own worker process"""
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(
+                target=run_chain_pipeline,
+                args=(self.config_path, chain, self.dry_run),
+                name=f"pipeline-{chain}",
+            )
+            for chain in self.chains
+        ]
+        for worker in workers:
+            worker.start()
+
+        def terminate():
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()  # SIGTERM, handled gracefully by the worker
+
+        loop = asyncio.get_running_loop()
+        # Workers share the process group and get CTRL+C directly, they stop themselves
+        loop.add_signal_handler(signal.SIGINT, lambda: None)
+        loop.add_signal_handler(signal.SIGTERM, terminate)
+        try:
+            await asyncio.gather(*[asyncio.to_thread(worker.join) for worker in workers])
+        finally:
+            loop.remove_signal_handler(signal.SIGINT)
+            loop.remove_signal_handler(signal.SIGTERM)
+
+    async def __run_in_process(self):
+        """Run every chain as a task on the current event loop"""
+        bots = [
+            DexScreenerBot(self.config_path, chain, dry_run=self.dry_run) for chain in self.chains
+        ]
+        for bot in bots:
+            bot.send_reports = False
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, lambda: [bot.request_stop() for bot in bots])
+        try:
+            await asyncio.gather(*[bot.run(install_signal_handlers=False) for bot in bots])
+        finally:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
@@ -0,0 +1,204 @@
+import abc
+import bisect
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping token addresses to instances"""
+
+    def __init__(self, instances: List[str], virtual_nodes: int = 64):
+        self.instances = sorted(instances)
+        points = sorted(
+            (_hash(f"{instance}#{i}"), instance)
+            for instance in self.instances
+            for i in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [owner for _, owner in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class ClusterBackend(abc.ABC):
+    """Shared store of instance leases and trade intents"""
+
+    @abc.abstractmethod
+    def renew_lease(self, instance_id: str, expires_at: float):
+        pass
+
+    @abc.abstractmethod
+    def release_lease(self, instance_id: str):
+        pass
+
+    @abc.abstractmethod
+    def live_instances(self, now: float) -> List[str]:
+        pass
+
+    @abc.abstractmethod
+    def claim_intent(self, key: str, instance_id: str, now: float, expires_at: float) -> bool:
+        """Record a trade intent, False if another live claim already exists"""
+
+    @abc.abstractmethod
+    def release_intent(self, key: str, instance_id: str):
+        """Drop a trade intent claimed by `instance_id`, so the trade can be retried"""
+
+
+class LocalClusterBackend(ClusterBackend):
+    """In-memory backend for instances sharing a process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._leases: Dict[str, float] = {}
+        self._intents: Dict[str, Tuple[str, float]] = {}  # key -> (instance, expires)
+
+    def renew_lease(self, instance_id: str, expires_at: float):
+        with self._lock:
+            self._leases[instance_id] = expires_at
+
+    def release_lease(self, instance_id: str):
+        with self._lock:
+            self._leases.pop(instance_id, None)
+
+    def live_instances(self, now: float) -> List[str]:
+        with self._lock:
+            return [instance for instance, expires in self._leases.items() if expires > now]
+
+    def claim_intent(self, key: str, instance_id: str, now: float, expires_at: float) -> bool:
+        with self._lock:
+            if self._intents.get(key, (None, 0))[1] > now:
+                return False
+            self._intents[key] = (instance_id, expires_at)
+            return True
+
+    def release_intent(self, key: str, instance_id: str):
+        with self._lock:
+            if self._intents.get(key, (None, 0))[0] == instance_id:
+                del self._intents[key]
+
+
+class SqliteClusterBackend(ClusterBackend):
+    """Backend storing leases and intents in the bot SQLite database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cluster_instance (
+                    instance_id TEXT PRIMARY KEY,
+                    lease_expires REAL
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trade_intent (
+                    intent_key TEXT PRIMARY KEY,
+                    instance_id TEXT,
+                    created_at REAL,
+                    expires_at REAL
+                )
+            """
+            )
+            conn.commit()
+
+    def renew_lease(self, instance_id: str, expires_at: float):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cluster_instance (instance_id, lease_expires) "
+                "VALUES (?, ?)",
+                (instance_id, expires_at),
+            )
+
+    def release_lease(self, instance_id: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM cluster_instance WHERE instance_id = ?", (instance_id,))
+
+    def live_instances(self, now: float) -> List[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT instance_id FROM cluster_instance WHERE lease_expires > ?", (now,)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def claim_intent(self, key: str, instance_id: str, now: float, expires_at: float) -> bool:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM trade_intent WHERE expires_at <= ?", (now,))
+            cursor = conn.execute(
+                """
+                INSERT OR IGNORE INTO trade_intent (
+                    intent_key, instance_id, created_at, expires_at
+                ) VALUES (?, ?, ?, ?)
+            """,
+                (key, instance_id, now, expires_at),
+            )
+            return cursor.rowcount == 1
+
+    def release_intent(self, key: str, instance_id: str):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "DELETE FROM trade_intent WHERE intent_key = ? AND instance_id = ?",
+                (key, instance_id),
+            )
+
+
+class InstanceCluster:
+    """Partition tokens between bot instances and deduplicate their trades"""
+
+    def __init__(
+        self,
+        backend: ClusterBackend,
+        instance_id: Optional[str] = None,
+        lease_ttl: float = 60,
+        virtual_nodes: int = 64,
+        intent_ttl: float = 3600,
+    ):
+        self.backend = backend
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self.virtual_nodes = virtual_nodes
+        self.intent_ttl = intent_ttl
+        self.ring = HashRing([self.instance_id], virtual_nodes)
+
+    def heartbeat(self):
+        """Renew this instance lease and rebuild the ring from live instances"""
+        now = time.time()
+        self.backend.renew_lease(self.instance_id, now + self.lease_ttl)
+        instances = sorted(self.backend.live_instances(now))
+        if instances != self.ring.instances:
+            logging.info(f"Cluster members: {instances}")
+            self.ring = HashRing(instances, self.virtual_nodes)
+
+    def owns(self, address: str) -> bool:
+        return self.ring.owner(address) in (self.instance_id, None)
+
+    def claim_trade(self, address: str, action: str) -> bool:
+        """Claim a trade globally, False if another instance already did"""
+        now = time.time()
+        return self.backend.claim_intent(
+            f"{action}:{address}", self.instance_id, now, now + self.intent_ttl
+        )
+
+    def release_trade(self, address: str, action: str):
+        """Give up a claimed trade that was not sent, so it can be retried"""
+        self.backend.release_intent(f"{action}:{address}", self.instance_id)
+
+    def leave(self):
+        """Release the lease so other instances take over immediately"""
+        self.backend.release_lease(self.instance_id)
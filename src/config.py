@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Iterable, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows, the file is still replaced atomically
+    fcntl = None
+
+from .models.token import Token
+from .timeseries import MomentumSignals
+
+
+class ConfigError(ValueError):
+    """Raised when the configuration does not validate"""
+
+
+@dataclass(frozen=True)
+class FilterSettings:
+    min_liquidity: float
+    min_volume_24h: float
+    min_fdv: float
+    max_price_change_24h: float
+
+
+@dataclass(frozen=True)
+class SupplyCheckSettings:
+    bundled_threshold: float
+    reject_mint_authority: bool = True
+    reject_freeze_authority: bool = True
+
+
+@dataclass(frozen=True)
+class FakeVolumeSettings:
+    repetitive_trade_threshold: float = 0.9
+    min_unique_wallets: int = 10
+    max_trade_size_variation: float = 0.1
+    min_signals: int = 2
+
+
+@dataclass(frozen=True)
+class MomentumSettings:
+    enabled: bool = False
+    min_momentum: float = 10.0
+    min_acceleration: float = 0.0
+    min_volume_surge: float = 2.0
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """Validated thresholds and the predicates built from them"""
+
+    filters: FilterSettings
+    supply_check: SupplyCheckSettings
+    fake_volume: FakeVolumeSettings
+    momentum: MomentumSettings
+    blacklisted_coins: Set[str]  # mutable, runtime blacklisting adds to them
+    blacklisted_devs: Set[str]
+    passes_filters: Callable[[Token, float], bool]
+    is_blacklisted: Callable[[Token], bool]
+    is_bundled: Callable[[float], bool]
+    has_rejected_authority: Callable[[Token], bool]
+    has_momentum: Callable[[MomentumSignals], bool]
+
+
+def _build(cls, section: Dict, name: str):
+    """Build a settings dataclass from a config section, checking types"""
+    if not isinstance(section, dict):
+        raise ConfigError(f"'{name}' must be an object")
+    values = {}
+    for field in fields(cls):
+        if field.name not in section:
+            continue
+        value = section[field.name]
+        if field.type is bool:
+            if not isinstance(value, bool):
+                raise ConfigError(f"'{name}.{field.name}' must be a boolean")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ConfigError(f"'{name}.{field.name}' must be a number")
+        elif value < 0:
+            raise ConfigError(f"'{name}.{field.name}' must not be negative")
+        values[field.name] = value
+    try:
+        return cls(**values)
+    except TypeError as e:
+        raise ConfigError(f"'{name}' is incomplete: {e}")
+
+
+def _address_set(config: Dict, key: str) -> Set[str]:
+    addresses = config.get(key, [])
+    if not isinstance(addresses, list) or not all(isinstance(a, str) for a in addresses):
+        raise ConfigError(f"'{key}' must be a list of addresses")
+    return set(addresses)
+
+
+def compile_rules(config: Dict) -> CompiledRules:
+    """Validate the filtering sections of a config and compile their predicates"""
+    filters = _build(FilterSettings, config.get("filters"), "filters")
+    supply_check = _build(SupplyCheckSettings, config.get("supply_check"), "supply_check")
+    fake_volume = _build(
+        FakeVolumeSettings, config.get("fake_volume_detection", {}), "fake_volume_detection"
+    )
+    momentum = _build(MomentumSettings, config.get("momentum", {}), "momentum")
+    blacklisted_coins = _address_set(config, "blacklisted_coins")
+    blacklisted_devs = _address_set(config, "blacklisted_devs")
+
+    # Bind thresholds to locals so the predicates do no dict lookups per token
+    min_liquidity = filters.min_liquidity
+    min_volume_24h = filters.min_volume_24h
+    min_fdv = filters.min_fdv
+    max_price_change_24h = filters.max_price_change_24h
+    bundled_threshold = supply_check.bundled_threshold
+    reject_mint = supply_check.reject_mint_authority
+    reject_freeze = supply_check.reject_freeze_authority
+    momentum_enabled = momentum.enabled
+    min_momentum = momentum.min_momentum
+    min_acceleration = momentum.min_acceleration
+    min_volume_surge = momentum.min_volume_surge
+
+    def passes_filters(token: Token, price_change_24h: float) -> bool:
+        return (
+            token.liquidity >= min_liquidity
+            and token.volume_24h >= min_volume_24h  # noqa: W503
+            and token.fdv >= min_fdv  # noqa: W503
+            and abs(price_change_24h) <= max_price_change_24h  # noqa: W503
+        )
+
+    def is_blacklisted(token: Token) -> bool:
+        return token.address in blacklisted_coins or (
+            token.dev_address is not None and token.dev_address in blacklisted_devs
+        )
+
+    def is_bundled(top_holder_ratio: float) -> bool:
+        return top_holder_ratio > bundled_threshold
+
+    def has_rejected_authority(token: Token) -> bool:
+        return bool(
+            (reject_mint and token.mint_authority)
+            or (reject_freeze and token.freeze_authority)  # noqa: W503
+        )
+
+    def has_momentum(signals: MomentumSignals) -> bool:
+        return (
+            momentum_enabled
+            and signals.momentum >= min_momentum  # noqa: W503
+            and signals.acceleration >= min_acceleration  # noqa: W503
+            and signals.volume_surge >= min_volume_surge  # noqa: W503
+        )
+
+    return CompiledRules(
+        filters=filters,
+        supply_check=supply_check,
+        fake_volume=fake_volume,
+        momentum=momentum,
+        blacklisted_coins=blacklisted_coins,
+        blacklisted_devs=blacklisted_devs,
+        passes_filters=passes_filters,
+        is_blacklisted=is_blacklisted,
+        is_bundled=is_bundled,
+        has_rejected_authority=has_rejected_authority,
+        has_momentum=has_momentum,
+    )
+
+
+def add_blacklisted(path: str, coins: Iterable[str] = (), devs: Iterable[str] = ()) -> Dict:
+    """Add addresses to the blacklists of a config file and return the merged config
+
+    Chain workers share the config file, so it is re-read under an exclusive
+    lock, merged and atomically replaced instead of overwritten from memory.
+    """
+    with open(f"{path}.lock", "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(path, "r") as f:
+            config = json.load(f)
+        for key, addresses in (("blacklisted_coins", coins), ("blacklisted_devs", devs)):
+            known = config.setdefault(key, [])
+            known.extend(address for address in dict.fromkeys(addresses) if address not in known)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(config, f, indent=4)
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return config
+
+
+class ConfigWatcher:
+    """Poll a config file and hand every valid new version to a callback"""
+
+    def __init__(
+        self, path: str, on_change: Callable[[Dict], None], interval: float = 2.0
+    ):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = self.__signature()
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+    def check(self) -> bool:
+        """Reload the file if it changed, True when a new config was applied"""
+        signature = self.__signature()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            with open(self.path, "r") as f:
+                config = json.load(f)
+            self.on_change(config)
+        except (OSError, ValueError) as e:
+            # ConfigError is a ValueError, the running config stays in place
+            logging.error(f"Config reload of {self.path} rejected: {e}")
+            return False
+        logging.info(f"Config reloaded from {self.path}")
+        return True
+
+    def __signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
@@ -1,17 +1,47 @@
 import sqlite3
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 import os
 
+from .models.position import Position
 from .models.token import Token
 
 
+class _Snapshot(NamedTuple):
+    timestamp: datetime
+    price: float
+    volume: float
+    liquidity: float
+    status: str
+
+
 class Database:
-    def __init__(self, db_path: str = "dist/dexscreener_data.db"):
+    DEFAULT_PATH = "dist/dexscreener_data.db"
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_PATH,
+        history_epsilon: float = 0.001,
+        keyframe_interval: float = 3600,
+    ):
         self.db_path = db_path
+        # A history row is written when a value moves by more than this ratio,
+        # the status changes, or the last row is older than keyframe_interval
+        self.history_epsilon = history_epsilon
+        self.keyframe_interval = keyframe_interval
+        self._snapshots: "OrderedDict[str, _Snapshot]" = OrderedDict()
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         self._setup_database()
 
+    @classmethod
+    def shard_path(cls, chain_id: str) -> str:
+        """Database file of a chain, Solana keeps the historical default path"""
+        if chain_id == "solana":
+            return cls.DEFAULT_PATH
+        root, ext = os.path.splitext(cls.DEFAULT_PATH)
+        return f"{root}_{chain_id}{ext}"
+
     def _setup_database(self):
         """Initialize SQLite database and create necessary tables"""
         with sqlite3.connect(self.db_path) as conn:
@@ -56,10 +86,41 @@ class Database:
             """
             )
 
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS position (
+                    token_address TEXT PRIMARY KEY,
+                    entry_price REAL,
+                    size REAL,
+                    buys INTEGER,
+                    opened_at TIMESTAMP,
+                    last_buy_at TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    state TEXT
+                )
+            """
+            )
+
+            # Time indexes keep incremental exports from scanning whole tables
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_token_history_timestamp "
+                "ON token_history (timestamp)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_token_last_updated ON token (last_updated)"
+            )
+            # Last history row of a token, for change-only history writes
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_token_history_address "
+                "ON token_history (token_address, id)"
+            )
+
             conn.commit()
 
     def save_token(self, token: Token):
         """Save token data and history to database"""
+        now = datetime.now()
+        token.last_updated = now  # exports pick up changed rows by last_updated
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
 
@@ -93,24 +154,110 @@ class Database:
                 ),
             )
 
+            snapshot = _Snapshot(
+                now, token.current_price, token.volume_24h, token.liquidity, token.status
+            )
+            if self.__history_changed(cursor, token.address, snapshot):
+                cursor.execute(
+                    """
+                    INSERT INTO token_history (
+                        token_address, timestamp, price, volume, liquidity, event_type
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (token.address, now.isoformat(), *snapshot[1:]),
+                )
+                self._snapshots[token.address] = snapshot
+                self._snapshots.move_to_end(token.address)
+
+            conn.commit()
+
+    def __history_changed(self, cursor, address: str, snapshot: _Snapshot) -> bool:
+        """Compare with the last history row, cached or read from the database"""
+        last = self._snapshots.get(address)
+        if last is None:
             cursor.execute(
                 """
-                INSERT INTO token_history (
-                    token_address, timestamp, price, volume, liquidity, event_type
-                ) VALUES (?, ?, ?, ?, ?, ?)
+                SELECT timestamp, price, volume, liquidity, event_type
+                FROM token_history WHERE token_address = ?
+                ORDER BY id DESC LIMIT 1
             """,
-                (
-                    token.address,
-                    datetime.now().isoformat(),
-                    token.current_price,
-                    token.volume_24h,
-                    token.liquidity,
-                    token.status,
-                ),
+                (address,),
             )
+            row = cursor.fetchone()
+            if row is None:
+                return True
+            last = self._snapshots[address] = _Snapshot(datetime.fromisoformat(row[0]), *row[1:])
+
+        if snapshot.status != last.status:
+            return True
+        if (snapshot.timestamp - last.timestamp).total_seconds() >= self.keyframe_interval:
+            return True
+        return any(
+            abs(new - old) > self.history_epsilon * abs(old)
+            for new, old in zip(snapshot[1:4], last[1:4])
+        )
+
+    @property
+    def snapshot_count(self) -> int:
+        return len(self._snapshots)
+
+    def trim_snapshots(self, max_entries: int) -> int:
+        """Forget the least recently written history snapshots down to `max_entries`"""
+        evicted = max(0, len(self._snapshots) - max_entries)
+        for _ in range(evicted):
+            self._snapshots.popitem(last=False)
+        return evicted
 
+    def save_positions(self, positions: List[Position]):
+        """Insert or update trading positions"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO position (
+                    token_address, entry_price, size, buys, opened_at,
+                    last_buy_at, updated_at, state
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        position.token_address,
+                        position.entry_price,
+                        position.size,
+                        position.buys,
+                        position.opened_at.isoformat(),
+                        position.last_buy_at.isoformat(),
+                        position.updated_at.isoformat(),
+                        position.state,
+                    )
+                    for position in positions
+                ],
+            )
             conn.commit()
 
+    def load_positions(self) -> List[Position]:
+        """Load every trading position"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+                SELECT token_address, entry_price, size, buys, opened_at,
+                    last_buy_at, updated_at, state
+                FROM position
+            """
+            )
+            return [
+                Position(
+                    token_address=row[0],
+                    entry_price=row[1],
+                    size=row[2],
+                    buys=row[3],
+                    opened_at=datetime.fromisoformat(row[4]),
+                    last_buy_at=datetime.fromisoformat(row[5]),
+                    updated_at=datetime.fromisoformat(row[6]),
+                    state=row[7],
+                )
+                for row in cursor.fetchall()
+            ]
+
     def generate_report(self) -> Dict:
         """Generate analysis report of tracked tokens"""
         with sqlite3.connect(self.db_path) as conn:
@@ -118,7 +265,14 @@ class Database:
 
             report = {
                 "total_tokens": 0,
-                "status_counts": {"normal": 0, "pumped": 0, "rugged": 0, "tier1": 0, "dead": 0},
+                "status_counts": {
+                    "normal": 0,
+                    "pumped": 0,
+                    "momentum": 0,
+                    "rugged": 0,
+                    "tier1": 0,
+                    "dead": 0,
+                },
                 "fake_volume_detected": 0,
                 "bundled_supply_count": 0,
             }
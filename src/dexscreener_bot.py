@@ -1,40 +1,76 @@
-import requests
 import json
-import time
-import sqlite3
-from datetime import datetime
 import logging
+import logging.handlers
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Optional
-from telegram import Bot
-from telegram.error import TelegramError
 import asyncio
 import aiohttp
-import signal
 import os
-import subprocess
-import traceback
-from solana.rpc.api import Client
-from solders.pubkey import Pubkey
+import signal
+import sqlite3
+import time
 
+from .cluster import InstanceCluster, LocalClusterBackend, SqliteClusterBackend
+from .config import ConfigWatcher, add_blacklisted, compile_rules
 from .database import Database
+from .dry_run_client import DryRunClient
+from .fake_volume_detector import FakeVolumeDetector
+from .http_cache import HttpCache
+from .json_decoder import JsonDecoder, DISCOVERY_FIELDS, PAIR_FIELDS
+from .loop_watchdog import LoopWatchdog
+from .memory_budget import MemoryBudget
+from .models.cycle_stats import CycleStats
 from .models.token import Token
-from .toxi_bot_client import ToxiBotClient
+from .pair_index import PairIndex
+from .pool_listener import PoolListener
+from .position_ledger import PositionLedger
+from .profiler import CycleProfiler
+from .seen_filter import RotatingBloomFilter
+from .solana_rpc import SolanaRpcClient
+from .timeseries import TimeSeriesStore
+
+
+def setup_logging(path: str = "dexscreener_bot.log", force: bool = False):
+    """Log to a file rotated so a long-running bot keeps a bounded log
+
+    Rotation is not safe across processes, each worker process logs to its own file.
+    """
+    logging.basicConfig(
+        handlers=[
+            logging.handlers.RotatingFileHandler(
+                path, maxBytes=10 * 1024 * 1024, backupCount=5
+            )
+        ],
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        force=force,
+    )
 
-# Set up logging
-logging.basicConfig(
-    filename="dexscreener_bot.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
 
+setup_logging()
 
-class DexScreenerBot:
-    def __init__(self, config_path: str = "config.json"):
-        # Add signal handler
-        signal.signal(signal.SIGINT, self.__signal_handler)
 
+class RugcheckUnavailable(Exception):
+    """Raised when the Rugcheck report of a token could not be fetched"""
+
+
+class DexScreenerBot:
+    def __init__(
+        self, config_path: str = "config.json", chain_id: str = "solana", dry_run: bool = False
+    ):
+        self.config_path = config_path
+        self.dry_run = dry_run
         self.config = self.__load_config(config_path)
-        self.database = Database()
+        self.rules = compile_rules(self.config)
+        self.chain_id = chain_id
+        chain_settings = self.config.get("chains", {}).get(chain_id, {})
+        history = self.config.get("history", {})
+        self.database = Database(
+            chain_settings.get("db_path", Database.shard_path(chain_id)),
+            history_epsilon=history.get("epsilon", 0.001),
+            keyframe_interval=history.get("keyframe_interval", 3600),
+        )
         self.headers = {
             "User-Agent": "DexScreenerBot/1.0",
             "Accept": "application/json",
@@ -42,68 +78,279 @@ class DexScreenerBot:
         # api settings
         self.dexscreener_url = self.config["api_settings"]["dexscreener_api_url"]
         self.rugcheck_url = self.config["api_settings"]["rugcheck_url"]
-        self.request_delay = self.config["api_settings"]["request_delay"]
-        # telegram settings
-        self.telegram_bot = Bot(self.config["telegram_settings"]["telegram_bot_token"])
+        # Rugcheck lookups started ahead of the token loop, 0 looks tokens up one by one
+        self.rugcheck_concurrency = self.config["api_settings"].get("rugcheck_concurrency", 4)
+        self._rugcheck_prefetch: Dict[str, asyncio.Task] = {}
+        # Rugcheck only reports on Solana tokens
+        self.rugcheck = chain_settings.get("rugcheck", chain_id == "solana")
+        self.request_delay = chain_settings.get(
+            "request_delay", self.config["api_settings"]["request_delay"]
+        )
+        self.http_cache = HttpCache()  # discovery endpoints, polled every cycle
+        self.decoder = JsonDecoder(
+            backend=self.config["api_settings"].get("json_backend", "auto"),
+            offload_threshold=self.config["api_settings"].get(
+                "json_offload_threshold", 256 * 1024
+            ),
+        )
+        # telegram settings, dry runs log notifications instead
+        self.telegram_bot = None
+        if not dry_run:
+            # Telegram libraries are slow to import, load them only when needed
+            from telegram import Bot
+
+            self.telegram_bot = Bot(self.config["telegram_settings"]["telegram_bot_token"])
         self.chat_id = self.config["telegram_settings"]["telegram_chat_id"]
         # transaction settings
         self.amount_sol = self.config["transaction_settings"].get("amountInSol", 0.05)
         self.amount_token = self.config["transaction_settings"].get(
             "amountInToken", 100
         )
+        positions = self.config.get("positions", {})
+        self.positions = PositionLedger(
+            self.database,
+            max_exposure=positions.get("max_exposure_sol", self.amount_sol),
+            cooldown=positions.get("cooldown", 3600),
+        )
+        self.positions.load()
         self.session = None  # Will be initialized in run()
-
-        # trading client
-        self.client = ToxiBotClient(
-            api_id=self.config["toxi_bot_settings"]["telegram_api_id"],
-            api_hash=self.config["toxi_bot_settings"]["telegram_api_hash"],
-            phone_number=self.config["toxi_bot_settings"]["telegram_phone_number"],
+        self.onchain = (
+            self.__build_onchain_client(self.config.get("solana_rpc", {}))
+            if chain_id == "solana"
+            else None
+        )
+        self.pool_listener = (
+            self.__build_pool_listener(self.config.get("pool_listener", {}))
+            if chain_id == "solana"
+            else None
+        )
+        # New pools analyzed within the cycle that saw them, the others wait for the next one
+        self.new_pools_per_cycle = self.config.get("pool_listener", {}).get("max_per_cycle", 20)
+        pair_settings = self.config.get("pairs", {})
+        self.pair_index = PairIndex(max_tokens=pair_settings.get("max_tokens", 5000))
+        # "deepest" analyzes the deepest pool, "aggregate" every pool weighted by liquidity
+        self.pair_selection = pair_settings.get("selection", "deepest")
+        self.fake_volume = FakeVolumeDetector(**self.config.get("fake_volume_detection", {}))
+        momentum_settings = self.config.get("momentum", {})
+        self.timeseries = TimeSeriesStore(
+            capacity=momentum_settings.get("window", 30),
+            lookback=momentum_settings.get("lookback", 5),
+            max_tokens=momentum_settings.get("max_tokens", 5000),
+        )
+        self.running = False
+        self.shutdown_timeout = self.config.get("shutdown_timeout", 10)
+        self._cycle_task: Optional[asyncio.Task] = None
+        self._tasks = set()  # background tasks cancelled on shutdown
+        self._trades = set()  # trades in flight, drained at cycle end and on shutdown
+
+        self.send_reports = True
+        self.cluster = self.__build_cluster(self.config.get("cluster", {}))
+        self.rejected, self.rejected_path = self.__build_rejected_filter(
+            self.config.get("rejected_filter", {})
+        )
+        profiling = self.config.get("profiling", {})
+        self.profiler = CycleProfiler(
+            output_dir=profiling.get("output_dir", "dist/profiles"),
+            cycles=profiling.get("cycles", 5),
+            top=profiling.get("top", 15),
         )
+        if profiling.get("enabled", False):
+            self.profiler.arm()
+        self.watchdog_settings = self.config.get("loop_watchdog", {})
+        self.watchdog = None
+        if self.watchdog_settings.get("enabled", False):
+            self.watchdog = LoopWatchdog(
+                interval=self.watchdog_settings.get("interval", 0.1),
+                threshold=self.watchdog_settings.get("threshold", 0.25),
+            )
+
+        self.last_cycle: Optional[CycleStats] = None
+        self.memory = self.__build_memory_budget(self.config.get("memory_budget", {}))
 
-    async def run(self):
+        # trading client, Toxi only trades on Solana
+        self.client = None
+        if chain_settings.get("trading", chain_id == "solana"):
+            self.client = DryRunClient() if dry_run else self.__build_toxi_client()
+
+    async def run(self, install_signal_handlers: bool = True):
         """Main bot execution loop with dynamic token fetching"""
         self.running = True
-        async with aiohttp.ClientSession() as session:
-            # set aiohttp session
-            self.session = session
+        if install_signal_handlers:
+            self.__install_signal_handlers()
+        try:
+            async with aiohttp.ClientSession() as session:
+                # set aiohttp session
+                self.session = session
+
+                await self.__setup_client()
+                await self.send_telegram_notification(
+                    f"DexScreenerBot started on {self.chain_id} and will run every minute."
+                )
+                logging.info(f"DexScreenerBot started on {self.chain_id}.")
 
-            # set toxi bot client
+                self.__start_background_tasks()
+
+                # run
+                while self.running:
+                    await self.__run_cycle()
+
+                await self.stop()
+        finally:
+            if install_signal_handlers:
+                self.__remove_signal_handlers()
+
+    async def run_once(self, install_signal_handlers: bool = True) -> Optional[CycleStats]:
+        """Run a single processing cycle and return its stats, for cron and timing runs"""
+        self.running = True
+        if install_signal_handlers:
+            self.__install_signal_handlers()
+        try:
+            async with aiohttp.ClientSession() as session:
+                self.session = session
+                await self.__setup_client()
+                await self.__run_cycle()
+                await self.stop(notify=False)
+        finally:
+            if install_signal_handlers:
+                self.__remove_signal_handlers()
+        if self.last_cycle and isinstance(self.client, DryRunClient):
+            self.last_cycle.intended_trades = list(self.client.trades)
+        return self.last_cycle
+
+    async def __setup_client(self):
+        # set toxi bot client
+        if self.client:
             await self.client.setup()
             await self.client.connect()
 
-            await self.send_telegram_notification(
-                "DexScreenerBot started and will run every minute."
+    def __start_background_tasks(self):
+        """Start the config watcher, cluster heartbeat and loop watchdog"""
+        reload_settings = self.config.get("config_reload", {})
+        if reload_settings.get("enabled", True):
+            watcher = ConfigWatcher(
+                self.config_path,
+                self.apply_config,
+                interval=reload_settings.get("interval", 2),
+            )
+            self.__spawn(watcher.watch())
+
+        if self.cluster:
+            self.cluster.heartbeat()
+            self.__spawn(self.__cluster_heartbeat())
+
+        if self.watchdog:
+            self.__spawn(self.watchdog.watch())
+        if self.pool_listener:
+            self.__spawn(self.pool_listener.listen())
+        if self.watchdog_settings.get("asyncio_debug", False):
+            # asyncio logs every callback slower than slow_callback_duration
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.watchdog_settings.get(
+                "slow_callback_duration", 0.1
             )
-            logging.info("DexScreenerBot started and will run every minute.")
 
-            # run
-            while self.running:
-                await self.__process_tokens()
+    async def __run_cycle(self):
+        """Run one processing cycle as a cancellable task, profiled when armed"""
+        cycle = self.__process_tokens()
+        if self.profiler.active:
+            cycle = self.profiler.profile(cycle)
+        self._cycle_task = asyncio.create_task(cycle)
+        try:
+            await self._cycle_task
+        except asyncio.CancelledError:
+            if self.running:
+                raise
+            logging.info("Processing cycle cancelled by shutdown")
+
+    def apply_config(self, config: Dict):
+        """Validate a new config and swap in its compiled rules"""
+        rules = compile_rules(config)  # raises ConfigError, keeping the current rules
+        settings = rules.fake_volume
+        self.fake_volume.repetitive_trade_threshold = settings.repetitive_trade_threshold
+        self.fake_volume.min_unique_wallets = settings.min_unique_wallets
+        self.fake_volume.max_trade_size_variation = settings.max_trade_size_variation
+        self.fake_volume.min_signals = settings.min_signals
+        was_profiling = self.config.get("profiling", {}).get("enabled", False)
+        if config.get("profiling", {}).get("enabled", False) and not was_profiling:
+            self.profiler.arm()
+        self.config, self.rules = config, rules
+
+    def request_stop(self):
+        """Ask the run loop to stop, cancelling the cycle in progress"""
+        self.running = False
+        if self._cycle_task and not self._cycle_task.done():
+            self._cycle_task.cancel()
 
-    async def stop(self):
-        """Stop the bot gracefully"""
+    async def stop(self, notify: bool = True):
+        """Stop the bot gracefully within the shutdown deadline"""
         self.running = False
-        await self.client.stop()
-        await self.send_telegram_notification("DexScreenerBot stopped.")
+        try:
+            await asyncio.wait_for(self.__shutdown(notify), timeout=self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"Shutdown did not complete within {self.shutdown_timeout}s")
+        finally:
+            # A trade stuck in a flood wait must not cost the positions already recorded
+            self.__save_rejected()
+            self.__flush_positions()
         logging.info("DexScreenerBot stopped.")
-        self.__exit()
+
+    async def __shutdown(self, notify: bool = True):
+        """Cancel pending work, then close client connections"""
+        await self.__drain_trades()
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if self.cluster:
+            self.cluster.leave()
+
+        if self.client:
+            await self.client.stop()
+        if self.pool_listener:
+            await self.pool_listener.close()
+        if self.onchain:
+            await self.onchain.close()
+        if notify:
+            await self.send_telegram_notification(f"DexScreenerBot stopped on {self.chain_id}.")
 
     async def send_telegram_notification(self, message: str):
         """Send notification via Telegram"""
+        if self.telegram_bot is None:
+            logging.info(f"[dry-run] Telegram notification: {message}")
+            return
+        from telegram.error import TelegramError
+
         try:
             await self.telegram_bot.send_message(chat_id=self.chat_id, text=message)
         except TelegramError as e:
             logging.error(f"Telegram notification error: {e}")
 
-    async def __fetch_api_data(self, endpoint: str) -> List[Dict]:
-        """Fetch data from a Dexscreener API endpoint asynchronously"""
+    async def __fetch_api_data(
+        self, endpoint: str, fields: Optional[Dict] = None, cache: bool = False
+    ) -> List[Dict]:
+        """Fetch data from a Dexscreener API endpoint asynchronously
+
+        With `cache`, requests are conditional and an unchanged body is not
+        decoded again, the data decoded from the previous one is returned.
+        """
         try:
             url = f"{self.dexscreener_url}/{endpoint}"
-            async with self.session.get(url, headers=self.headers) as response:
+            headers = {**self.headers, **self.http_cache.validators(url)} if cache else self.headers
+            async with self.session.get(url, headers=headers) as response:
+                if cache and response.status == 304 and self.http_cache.get(url):
+                    return self.http_cache.get(url).data
                 response.raise_for_status()
-                data = await response.json()
-                return data
-        except aiohttp.ClientError as e:
+                raw = await response.read()
+            if not cache:
+                return await self.decoder.decode(raw, fields)
+            data = self.http_cache.unchanged(url, response.headers, raw)
+            if data is None:
+                data = await self.decoder.decode(raw, fields)
+                self.http_cache.store(url, response.headers, raw, data)
+            return data
+        except (aiohttp.ClientError, ValueError) as e:
             logging.error(f"Error fetching {endpoint}: {e}")
             return []
 
@@ -118,7 +365,9 @@ class DexScreenerBot:
         token_addresses = set()
 
         # Create tasks for all API calls
-        tasks = [self.__fetch_api_data(endpoint) for endpoint in endpoints]
+        tasks = [
+            self.__fetch_api_data(endpoint, DISCOVERY_FIELDS, cache=True) for endpoint in endpoints
+        ]
         # Execute all requests concurrently and wait for results
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -126,7 +375,7 @@ class DexScreenerBot:
         for result in results:
             if isinstance(result, list):  # Successful response
                 for item in result:
-                    if item["chainId"] == "solana":
+                    if item.get("chainId") == self.chain_id:
                         token_addresses.add(item["tokenAddress"])
             else:
                 logging.warning(f"Error in one of the API calls: {result}")
@@ -137,152 +386,263 @@ class DexScreenerBot:
     async def __fetch_token_data(self, token_address: str) -> Optional[Dict]:
         """Fetch detailed data for a specific token"""
         try:
-            url = f"{self.dexscreener_url}/tokens/v1/solana/{token_address}"
+            url = f"{self.dexscreener_url}/tokens/v1/{self.chain_id}/{token_address}"
             async with self.session.get(url, headers=self.headers) as response:
                 response.raise_for_status()
-                data = await response.json()
-                return data[0] if len(data) > 0 else None
+                raw = await response.read()
+            data = await self.decoder.decode(raw, PAIR_FIELDS)
+            # Pairs quoted in the token price another token, EVM addresses may differ in case
+            pairs = [
+                pair
+                for pair in data or []
+                if str((pair.get("baseToken") or {}).get("address")).lower()
+                == token_address.lower()  # noqa: W503
+            ]
+            if not pairs:
+                return None
+            self.pair_index.update(token_address, pairs)
+            if self.pair_selection == "aggregate":
+                return self.pair_index.aggregate(token_address)
+            return self.pair_index.best(token_address)
         except Exception as e:
             logging.error(f"Error fetching token data for {token_address}: {e}")
             return None
 
     async def __verify_rugcheck(self, token: Token) -> bool:
-        """Verify token contract status on Rugcheck.xyz with specific risk checks"""
-        try:
-            url = f"{self.rugcheck_url}/{token.address}/report/summary"
-            async with self.session.get(url, headers=self.headers) as response:
-                response.raise_for_status()
-                result = await response.json()
-
-                risks = result.get("risks", [])
-                score = result.get("score", 0)
-
-                # Define dealbreaker risks
-                dealbreaker_risks = {
-                    "Copycat",
-                    "High holder correlation",
-                    "Mutable metadata",
-                    "Symbol Mismatch",
-                    "Name Mismatch",
-                }
-
-                # Check for dealbreaker risks
-                detected_risks = [risk["name"] for risk in risks]
-                dealbreakers = [
-                    risk for risk in detected_risks if risk in dealbreaker_risks
-                ]
-
-                if not risks or score < 300:
-                    token.rugcheck_status = "good"
-                    return True
-                elif not dealbreakers:
-                    # Risks exist but none are dealbreakers
-                    token.rugcheck_status = "good"
-                    return True
-                else:
-                    # Dealbreaker risks found
-                    token.rugcheck_status = "rug"
-                    return False
+        """Verify token contract status on Rugcheck.xyz with specific risk checks
 
+        A failed lookup raises RugcheckUnavailable, it says nothing about the token.
+        """
+        prefetched = self._rugcheck_prefetch.pop(token.address, None)
+        try:
+            if prefetched:
+                result = await prefetched
+            else:
+                result = await self.__fetch_rugcheck(token.address)
         except Exception as e:
-            logging.error(f"Rugcheck API error for {token.address}: {e}")
             token.rugcheck_status = "Error"
+            raise RugcheckUnavailable(f"Rugcheck API error for {token.address}: {e!r}") from e
+        return self.__evaluate_rugcheck(token, result)
+
+    async def __fetch_rugcheck(self, token_address: str) -> Dict:
+        url = f"{self.rugcheck_url}/{token_address}/report/summary"
+        async with self.session.get(url, headers=self.headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    @staticmethod
+    def __evaluate_rugcheck(token: Token, result: Dict) -> bool:
+        risks = result.get("risks", [])
+        score = result.get("score", 0)
+
+        # Define dealbreaker risks
+        dealbreaker_risks = {
+            "Copycat",
+            "High holder correlation",
+            "Mutable metadata",
+            "Symbol Mismatch",
+            "Name Mismatch",
+        }
+
+        # Check for dealbreaker risks
+        detected_risks = [risk["name"] for risk in risks]
+        dealbreakers = [risk for risk in detected_risks if risk in dealbreaker_risks]
+
+        if not risks or score < 300:
+            token.rugcheck_status = "good"
+            return True
+        elif not dealbreakers:
+            # Risks exist but none are dealbreakers
+            token.rugcheck_status = "good"
+            return True
+        else:
+            # Dealbreaker risks found
+            token.rugcheck_status = "rug"
             return False
 
+    def __prefetch_rugcheck(self, upcoming: List[str]):
+        """Start the Rugcheck lookups of the next tokens so they overlap the pair fetches
+
+        Only `rugcheck_concurrency` tokens ahead are looked up, so reports are
+        at most that many request delays old when used and Rugcheck does not
+        get a burst of the whole discovered list.
+        """
+        if not self.rugcheck:
+            return
+        for token_address in upcoming[: self.rugcheck_concurrency]:
+            if token_address in self._rugcheck_prefetch:
+                continue
+            task = asyncio.create_task(self.__fetch_rugcheck(token_address))
+            # Errors are reported when the result is used, not by unused lookups
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._rugcheck_prefetch[token_address] = task
+
+    def __cancel_rugcheck(self, token_address: str):
+        """Drop the lookup of a token rejected before its Rugcheck was needed"""
+        task = self._rugcheck_prefetch.pop(token_address, None)
+        if task:
+            task.cancel()
+
     def __check_token_socials(self, token: Token) -> bool:
         """Check if token has at least one website and one social media"""
         return len(token.websites) > 0 and len(token.socials) > 0
 
+    def __apply_onchain_info(self, token: Token):
+        """Copy cached on-chain authorities and holder distribution onto the token"""
+        info = self.onchain.get(token.address) if self.onchain else None
+        if info is None:
+            return
+        token.dev_address = info.creator
+        token.mint_authority = info.mint_authority
+        token.freeze_authority = info.freeze_authority
+        # Vaults of CLMM and PumpSwap pools are owned by the pool, the pair address
+        pools = {pair.get("pairAddress") for pair in self.pair_index.pairs(token.address)}
+        token.top_holders_ratio = self.onchain.holders_ratio(info, pools)
+
+    def __check_authorities(self, token: Token) -> bool:
+        """Check if the mint still has a mint or freeze authority we refuse"""
+        return self.rules.has_rejected_authority(token)
+
     def __check_bundled_supply(self, token: Token) -> bool:
         """Check if token supply is bundled"""
-        top_holder_ratio = 1 - (token.liquidity / token.fdv) if token.fdv > 0 else 0.0
-        is_bundled = top_holder_ratio > self.config["supply_check"]["bundled_threshold"]
+        if token.top_holders_ratio is not None:
+            top_holder_ratio = token.top_holders_ratio
+        else:
+            # No on-chain data, estimate concentration from liquidity and fdv
+            top_holder_ratio = 1 - (token.liquidity / token.fdv) if token.fdv > 0 else 0.0
+        is_bundled = self.rules.is_bundled(top_holder_ratio)
         token.supply_bundled = is_bundled
         return is_bundled
 
     def __detect_fake_volume(self, token: Token, price_change_24h: float) -> bool:
         """Detect fake volume patterns"""
         if (
-            token.volume_24h > self.config["filters"]["min_volume_24h"] * 10
+            token.volume_24h > self.rules.filters.min_volume_24h * 10
             and abs(price_change_24h) < 5  # noqa: W503
-        ):
+        ) or self.fake_volume.is_suspicious(token.address):
             token.fake_volume_detected = True
             return True
         return False
 
     def __apply_filters(self, token: Token, price_change_24h: float) -> bool:
         """Apply configured filters to token data"""
-        filters = self.config["filters"]
-        return (
-            token.liquidity >= filters["min_liquidity"]
-            and token.volume_24h >= filters["min_volume_24h"]  # noqa: W503
-            and token.fdv >= filters["min_fdv"]  # noqa: W503
-            and abs(price_change_24h) <= filters["max_price_change_24h"]  # noqa: W503
-        )
+        return self.rules.passes_filters(token, price_change_24h)
 
     def __check_blacklists(self, token: Token) -> bool:
         """Check if token or developer is blacklisted"""
-        return (
-            token.dev_address and token.dev_address in self.config["blacklisted_devs"]
-        ) or token.address in self.config["blacklisted_coins"]
+        return self.rules.is_blacklisted(token)
 
     def __update_blacklists(self, token: Token):
         """Update blacklists for token and developer"""
-        if token.address not in self.config["blacklisted_coins"]:
+        coins, devs = [], []
+        if token.address not in self.rules.blacklisted_coins:
+            self.rules.blacklisted_coins.add(token.address)
             self.config["blacklisted_coins"].append(token.address)
+            coins.append(token.address)
             logging.info(f"Blacklisted token: {token.address}")
         if (
             token.dev_address
-            and token.dev_address not in self.config["blacklisted_devs"]  # noqa: W503
+            and token.dev_address not in self.rules.blacklisted_devs  # noqa: W503
         ):
+            self.rules.blacklisted_devs.add(token.dev_address)
             self.config["blacklisted_devs"].append(token.dev_address)
+            devs.append(token.dev_address)
             logging.info(f"Blacklisted developer: {token.dev_address}")
-        with open("config.json", "w") as f:
-            json.dump(self.config, f, indent=4)
+        if self.dry_run or (not coins and not devs):
+            return
+        try:
+            # Merged with the entries other chain workers wrote since our last reload
+            add_blacklisted(self.config_path, coins, devs)
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not save blacklists to {self.config_path}: {e}")
 
     async def __trade_with_toxi_bot(
         self, token: Token, action: str, amount: float
     ) -> bool:
-        try:
+        if self.client is None:
             logging.info(
-                f"{action.upper()} token {token.address} with status {token.status} ..."
+                f"No trading client on {self.chain_id}, skipping {action} of {token.address}"
             )
-
+            return False
+        if self.cluster and not self.cluster.claim_trade(token.address, action):
+            logging.info(f"{action.capitalize()} of {token.address} already claimed in cluster")
+            return False
+        logging.info(f"{action.upper()} token {token.address} with status {token.status} ...")
+        try:
             response = await self.client.send_buy_command(token.address, amount)
+        except Exception:
+            logging.exception(f"{action.capitalize()} command for {token.address} was not sent")
+            if self.cluster:
+                # Nothing reached Toxi, another instance may trade the token
+                self.__release_trade(token.address, action)
+            return False
+        return await self.__check_trade_response(token, action, response)
 
-            print("RES", response)
-
-            if "errors" in response and response["errors"]:
-                logging.error(
-                    f"{action.capitalize()} transaction failed for token {token.address}: {response['errors']}"  # noqa: E501
-                )
-                return False
-
-            logging.info(
-                f"Transaction {action.upper()} successful for token {token.address}"
-            )
-            await self.send_telegram_notification(
-                f"{action.capitalize()} command sent for {token.symbol}"
-            )
-            return True
-        except Exception as e:
-            print(traceback.format_exc())
+    def __release_trade(self, address: str, action: str):
+        try:
+            self.cluster.release_trade(address, action)
+        except sqlite3.Error as e:
+            logging.error(f"Could not release the {action} claim of {address}: {e}")
+
+    async def __check_trade_response(self, token: Token, action: str, response) -> bool:
+        """Check the response of a sent command, its claim is kept either way"""
+        # Toxi clients return the sent telethon Message, only dict responses carry errors
+        errors = response.get("errors") if isinstance(response, dict) else None
+        if errors:
             logging.error(
-                f"{action.capitalize()} transaction failed for token {token.address}: {e}"
+                f"{action.capitalize()} transaction failed for token {token.address}: {errors}"
             )
             return False
 
+        logging.info(f"Transaction {action.upper()} successful for token {token.address}")
+        await self.send_telegram_notification(
+            f"{action.capitalize()} command sent for {token.symbol}"
+        )
+        return True
+
+    async def __buy(self, token: Token) -> bool:
+        """Buy a token unless its position is at max exposure or cooling down"""
+        if not self.positions.can_buy(token.address, self.amount_sol):
+            logging.info(f"Position limit reached for {token.address}, skipping buy")
+            return False
+        if not await self.__trade_with_toxi_bot(token, "buy", self.amount_sol):
+            return False
+        self.positions.record_buy(token.address, token.current_price, self.amount_sol)
+        if self.last_cycle:
+            self.last_cycle.trades += 1
+        return True
+
+    def __fan_out_buy(self, token: Token):
+        """Send the buy in the background, the analysis goes on with the next token"""
+        task = asyncio.create_task(self.__buy(token))
+        self._trades.add(task)
+        task.add_done_callback(lambda task: self.__trade_done(token, task))
+
+    def __trade_done(self, token: Token, task: asyncio.Task):
+        """Forget a finished trade, logging the error that made it fail"""
+        self._trades.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error(f"Buy of {token.address} failed", exc_info=task.exception())
+
+    async def __drain_trades(self):
+        """Wait for the trades in flight to complete"""
+        if self._trades:
+            await asyncio.gather(*self._trades, return_exceptions=True)
+
     async def __analyze_and_trade(self, token_data: dict) -> Optional[Token]:
         """Analyze token and execute trade if conditions met"""
         token = Token.parse(token_data)
         price_change_24h = float(token_data["priceChange"]["h24"])
+        self.__apply_onchain_info(token)
+        self.fake_volume.update(token.address, token_data)
+        signals = self.timeseries.record(token.address, token_data)
 
         if not self.__check_token_socials(token):
             return None
-        if not await self.__verify_rugcheck(token):
+        if self.rugcheck and not await self.__verify_rugcheck(token):
             self.__update_blacklists(token)
             return None
-        if self.__check_bundled_supply(token):
+        if self.__check_authorities(token) or self.__check_bundled_supply(token):
             return None
         if (
             self.__check_blacklists(token)
@@ -293,12 +653,19 @@ class DexScreenerBot:
 
         if price_change_24h > 100:
             token.status = "pumped"
-            await self.__trade_with_toxi_bot(token, "buy", self.amount_sol)
+            self.__fan_out_buy(token)
+        elif self.rules.has_momentum(signals):
+            token.status = "momentum"
+            logging.info(
+                f"Momentum on {token.address}: {signals.momentum:.1f}% "
+                f"accel {signals.acceleration:.1f} volume x{signals.volume_surge:.1f}"
+            )
+            self.__fan_out_buy(token)
         elif price_change_24h < -90 and token.liquidity < 1000:
             token.status = "rugged"
         elif token.volume_24h > 1000000 and token.liquidity > 250000:
             token.status = "tier1"
-            await self.__trade_with_toxi_bot(token, "buy", self.amount_sol)
+            self.__fan_out_buy(token)
         else:
             token.status = "dead"
 
@@ -306,30 +673,278 @@ class DexScreenerBot:
 
     async def __process_tokens(self):
         """Process tokens once (core logic of run)"""
-        token_list = await self.__get_dynamic_token_list()
-
-        for token_address in token_list:
-            try:
-                token_data = await self.__fetch_token_data(token_address)
-                if token_data:
-                    token = await self.__analyze_and_trade(token_data)
-                    if token:
-                        self.database.save_token(token)
-                        logging.info(
-                            f"Processed token: {token.address} - Status: {token.status}"
-                        )
-                    else:
-                        logging.info(f"Token rejected: {token_address}")
+        stats = self.last_cycle = CycleStats(chain_id=self.chain_id)
+        started = time.perf_counter()
+        discovered = await self.__get_dynamic_token_list()
+        if self.pool_listener:
+            # New pools first, they are the earliest signals
+            discovered = list(dict.fromkeys(self.pool_listener.pending() + discovered))
+        token_list = self.__select_tokens(discovered)
+        if self.onchain:
+            await self.onchain.prefetch(token_list)
+        stats.discovered, stats.selected = len(discovered), len(token_list)
+        stats.discovery_time = time.perf_counter() - started
+
+        queue, queued = deque(token_list), set(token_list)
+        new_pools = 0
+        try:
+            while queue:
+                if new_pools < self.new_pools_per_cycle:
+                    new_pools += await self.__queue_new_pools(
+                        queue, queued, stats, self.new_pools_per_cycle - new_pools
+                    )
+                self.__prefetch_rugcheck(list(islice(queue, self.rugcheck_concurrency)))
+                token_address = queue.popleft()
+                token_started = time.perf_counter()
+                try:
+                    await self.__process_token(token_address, stats)
+                except Exception as e:
+                    stats.errors += 1
+                    logging.error(f"Error processing token {token_address}: {e}")
+                self.__cancel_rugcheck(token_address)
+                elapsed = time.perf_counter() - token_started
+                stats.token_time_total += elapsed
+                stats.token_time_max = max(stats.token_time_max, elapsed)
                 await asyncio.sleep(self.request_delay)
-            except Exception as e:
-                logging.error(f"Error processing token {token_address}: {e}")
-
+        finally:
+            # Lookups left behind by a cancelled cycle
+            for token_address in list(self._rugcheck_prefetch):
+                self.__cancel_rugcheck(token_address)
+
+        await self.__drain_trades()
+        self.__save_rejected()
+        self.__flush_positions()
+        self.memory.enforce()
+        stats.duration = time.perf_counter() - started
+        logging.info(f"Cycle done, {stats.summary()}")
+
+        if self.send_reports:
+            await self.__send_report()
+
+    async def __queue_new_pools(
+        self, queue: deque, queued: set, stats: CycleStats, limit: int
+    ) -> int:
+        """Put up to `limit` pools created during the cycle at the front of the queue
+
+        Pools beyond the limit wait for the next cycle, so a burst of launches
+        cannot keep the cycle from reaching the listed tokens and its end.
+        """
+        if not self.pool_listener:
+            return 0
+        fresh = self.__select_tokens(self.pool_listener.fresh(limit))
+        mints = [mint for mint in fresh if mint not in queued]
+        if not mints:
+            return 0
+        if self.onchain:
+            await self.onchain.prefetch(mints)
+        queue.extendleft(reversed(mints))
+        queued.update(mints)
+        stats.discovered += len(mints)
+        stats.selected += len(mints)
+        return len(mints)
+
+    async def __process_token(self, token_address: str, stats: CycleStats):
+        token_data = await self.__fetch_token_data(token_address)
+        if not token_data:
+            return
+        if self.pool_listener:
+            self.pool_listener.resolve(token_address)
+        try:
+            token = await self.__analyze_and_trade(token_data)
+        except RugcheckUnavailable as e:
+            # Not a verdict on the token, it is not remembered as rejected
+            stats.errors += 1
+            logging.error(str(e))
+            return
+        if token:
+            if not self.dry_run:
+                self.database.save_token(token)
+            stats.processed += 1
+            logging.info(f"Processed token: {token.address} - Status: {token.status}")
+        else:
+            if self.rejected is not None:
+                self.rejected.add(token_address)
+            stats.rejected += 1
+            logging.info(f"Token rejected: {token_address}")
+
+    def __select_tokens(self, token_list: List[str]) -> List[str]:
+        """Drop recently rejected tokens and tokens owned by other instances"""
+        if self.rejected is not None:
+            token_list = [address for address in token_list if address not in self.rejected]
+        if self.cluster:
+            token_list = [address for address in token_list if self.cluster.owns(address)]
+            logging.info(f"{len(token_list)} tokens assigned to {self.cluster.instance_id}")
+        return token_list
+
+    async def __send_report(self):
         report = self.database.generate_report()
+        report["chain"] = self.chain_id
         report["blacklisted"] = len(self.config["blacklisted_coins"])
+        rss = self.memory.rss_bytes()
+        if rss is not None:
+            report["rss_mb"] = round(rss / 1024 / 1024, 1)
+        logging.info(f"Memory usage: {self.memory.usage()}")
+        if self.watchdog:
+            report["loop_lag"] = self.watchdog.stats()
         await self.send_telegram_notification(
             f"Analysis Report: {json.dumps(report, indent=2)}"
         )
 
+    def __spawn(self, coro) -> asyncio.Task:
+        """Start a background task that is cancelled on shutdown"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def __cluster_heartbeat(self):
+        """Renew the cluster lease well before it expires"""
+        while self.running:
+            await asyncio.sleep(self.cluster.lease_ttl / 3)
+            try:
+                self.cluster.heartbeat()
+            except Exception as e:
+                logging.error(f"Cluster heartbeat error: {e}")
+
+    def __build_rejected_filter(self, settings: Dict):
+        """Create the recently rejected filter and restore it from disk"""
+        if not settings.get("enabled", False):
+            return None, None
+        rejected = RotatingBloomFilter(
+            capacity=settings.get("capacity", 100000),
+            error_rate=settings.get("error_rate", 0.001),
+            window=settings.get("window", 3600),
+            generations=settings.get("generations", 2),
+            max_bytes=settings.get("max_bytes"),
+        )
+        default_path = f"{os.path.splitext(self.database.db_path)[0]}_rejected.bloom"
+        path = settings.get("path") or default_path
+        if rejected.load(path):
+            logging.info(f"Restored rejected tokens filter from {path}")
+        return rejected, path
+
+    def __save_rejected(self):
+        if self.rejected is None or self.dry_run:
+            return  # a dry run must not make the live bot skip its rejected tokens
+        try:
+            self.rejected.save(self.rejected_path)
+        except OSError as e:
+            logging.error(f"Could not save rejected tokens filter: {e}")
+
+    def __flush_positions(self):
+        if self.dry_run:
+            return  # intended trades must not block real buys later
+        try:
+            self.positions.flush()
+        except sqlite3.Error as e:
+            # Positions stay dirty in memory and are written on the next flush
+            logging.error(f"Could not save positions: {e}")
+
+    def __build_memory_budget(self, settings: Dict) -> MemoryBudget:
+        """Register every cache and index growing with uptime"""
+        memory = MemoryBudget(settings.get("caps", {}))
+        memory.register(
+            "fake_volume",
+            self.fake_volume.__len__,
+            self.fake_volume.trim,
+            cap=self.fake_volume.max_tokens,
+        )
+        memory.register(
+            "timeseries",
+            self.timeseries.__len__,
+            self.timeseries.trim,
+            cap=self.timeseries.max_tokens,
+        )
+        memory.register(
+            "history_snapshots",
+            lambda: self.database.snapshot_count,
+            self.database.trim_snapshots,
+            cap=10000,
+        )
+        memory.register(
+            "pair_index", self.pair_index.__len__, self.pair_index.trim, cap=5000
+        )
+        memory.register("positions", self.positions.__len__, self.positions.trim, cap=10000)
+        if self.pool_listener:
+            memory.register(
+                "pool_listener", self.pool_listener.__len__, self.pool_listener.trim, cap=10000
+            )
+            memory.register(
+                "pool_listener_pending",
+                lambda: self.pool_listener.pending_count,
+                self.pool_listener.trim_pending,
+                cap=self.pool_listener.max_pending,
+            )
+        if self.onchain:
+            memory.register("onchain_cache", self.onchain.__len__, self.onchain.trim, cap=10000)
+        for key in ("blacklisted_coins", "blacklisted_devs"):
+            # Safety data, only reported: an evicted rug would become buyable again
+            memory.register(key, lambda key=key: len(getattr(self.rules, key)))
+        return memory
+
+    def __build_cluster(self, settings: Dict) -> Optional[InstanceCluster]:
+        """Join the instance cluster when coordination is enabled in config"""
+        if not settings.get("enabled", False):
+            return None
+        if settings.get("backend", "sqlite") == "local" or self.dry_run:
+            # Dry runs keep their lease and intents to themselves
+            backend = LocalClusterBackend()
+        else:
+            backend = SqliteClusterBackend(settings.get("db_path") or self.database.db_path)
+        return InstanceCluster(
+            backend,
+            instance_id=settings.get("instance_id"),
+            lease_ttl=settings.get("lease_ttl", 60),
+            virtual_nodes=settings.get("virtual_nodes", 64),
+            intent_ttl=settings.get("intent_ttl", 3600),
+        )
+
+    def __build_toxi_client(self):
+        """Create the Toxi client, a pool of them when several accounts are set"""
+        from .toxi_bot_client import ToxiBotClient
+
+        settings = self.config["toxi_bot_settings"]
+        clients = [
+            ToxiBotClient(
+                api_id=account["telegram_api_id"],
+                api_hash=account["telegram_api_hash"],
+                phone_number=account["telegram_phone_number"],
+            )
+            for account in settings.get("accounts") or [settings]
+        ]
+        if len(clients) == 1:
+            return clients[0]
+
+        from .toxi_client_pool import ToxiClientPool
+
+        return ToxiClientPool(clients, max_flood_wait=settings.get("max_flood_wait", 30))
+
+    def __build_pool_listener(self, settings: Dict) -> Optional[PoolListener]:
+        """Subscribe to new pool logs when enabled in config"""
+        if not settings.get("enabled", False):
+            return None
+        return PoolListener(
+            ws_url=settings.get("ws_url", "wss://api.mainnet-beta.solana.com"),
+            rpc_url=settings.get("rpc_url"),
+            rpc=self.onchain,
+            max_attempts=settings.get("max_attempts", 5),
+            max_pending=settings.get("max_pending", 1000),
+        )
+
+    @staticmethod
+    def __build_onchain_client(settings: Dict) -> Optional[SolanaRpcClient]:
+        """Create the Solana RPC enrichment client when enabled in config"""
+        if not settings.get("enabled", False):
+            return None
+        return SolanaRpcClient(
+            rpc_url=settings.get("rpc_url", "https://api.mainnet-beta.solana.com"),
+            batch_size=settings.get("batch_size", 100),
+            pool_size=settings.get("pool_size", 4),
+            cache_ttl=settings.get("cache_ttl", 300),
+            top_holders=settings.get("top_holders", 10),
+            ignored_creators=settings.get("ignored_creators", []),
+        )
+
     def __load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file"""
         try:
@@ -339,22 +954,32 @@ class DexScreenerBot:
             logging.error(f"Error loading config: {e}")
             raise
 
-    def __signal_handler(self, signum, frame):
-        """Handle CTRL+C signal"""
-        logging.info("Received shutdown signal (CTRL+C)")
-        asyncio.create_task(self.stop())
-
-    def __exit(self):
-        """Kill all subprocess and exit app"""
-        pid = os.getpid()
-
-        process = subprocess.Popen(
-            ["ps", "o", "pid=", "--pid", str(pid)],
-            stdout=subprocess.PIPE,
-            universal_newlines=True,
-        )
-
-        for output_pid in process.stdout:
-            os.kill(int(output_pid), signal.SIGKILL)
-
-        exit()
+    def __install_signal_handlers(self):
+        """Route SIGINT and SIGTERM to a graceful shutdown on the running loop"""
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.__signal_handler, signum)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform or outside the main thread
+                pass
+        if hasattr(signal, "SIGUSR1"):
+            try:
+                loop.add_signal_handler(signal.SIGUSR1, self.profiler.arm)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    def __remove_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM, getattr(signal, "SIGUSR1", None)):
+            if signum is None:
+                continue
+            try:
+                loop.remove_signal_handler(signum)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    def __signal_handler(self, signum: int):
+        """Handle CTRL+C and termination signals"""
+        logging.info(f"Received shutdown signal ({signal.Signals(signum).name})")
+        self.request_stop()
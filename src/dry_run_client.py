@@ -0,0 +1,37 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+class DryRunClient:
+    """Stand-in for ToxiBotClient that records trades instead of sending them"""
+
+    def __init__(self):
+        self.trades: List[Dict] = []
+
+    async def setup(self):
+        pass
+
+    async def connect(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send_buy_command(self, token_mint: str, buy_amount: float) -> Any:
+        return self.__record("buy", token_mint, buy_amount)
+
+    async def send_sell_command(self, token_mint: str, sell_percentage: int) -> Any:
+        return self.__record("sell", token_mint, sell_percentage)
+
+    def __record(self, action: str, token_mint: str, amount: float) -> Dict:
+        self.trades.append(
+            {
+                "action": action,
+                "token": token_mint,
+                "amount": amount,
+                "at": datetime.now().isoformat(),
+            }
+        )
+        logging.info(f"[dry-run] {action} {token_mint} {amount}")
+        return {}
@@ -0,0 +1,223 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+# Columns exported per table, with their Arrow type name. Rows are partitioned
+# by day of their `time` column and exported incrementally past the last
+# `cursor` value, which must be increasing for every new or updated row.
+TABLES: Dict[str, Dict] = {
+    "token": {
+        "time": "last_updated",
+        "cursor": "last_updated",
+        "columns": [
+            ("token_address", "string"),
+            ("symbol", "string"),
+            ("name", "string"),
+            ("chain_id", "string"),
+            ("dev_address", "string"),
+            ("first_seen", "timestamp"),
+            ("last_updated", "timestamp"),
+            ("max_price", "float64"),
+            ("min_price", "float64"),
+            ("current_price", "float64"),
+            ("volume_24h", "float64"),
+            ("liquidity", "float64"),
+            ("fdv", "float64"),
+            ("status", "string"),
+            ("fake_volume_detected", "bool"),
+            ("rugcheck_status", "string"),
+            ("supply_bundled", "bool"),
+        ],
+    },
+    "token_history": {
+        "time": "timestamp",
+        # Rows written within the same timestamp are not skipped by the next export
+        "cursor": "id",
+        "columns": [
+            ("id", "int64"),
+            ("token_address", "string"),
+            ("timestamp", "timestamp"),
+            ("price", "float64"),
+            ("volume", "float64"),
+            ("liquidity", "float64"),
+            ("event_type", "string"),
+        ],
+    },
+}
+
+FORMATS = ("parquet", "arrow")
+
+
+@dataclass
+class ExportStats:
+    table: str
+    rows: int = 0
+    files: int = 0
+    high_water_mark: Optional[Union[str, int]] = None
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Exports need pyarrow, install it with `pip install pyarrow`")
+    return pyarrow
+
+
+class TableExporter:
+    """Stream SQLite tables to day-partitioned Parquet or Arrow IPC files"""
+
+    STATE_FILE = "_export_state.json"
+
+    def __init__(
+        self,
+        db_path: str,
+        output_dir: str,
+        fmt: str = "parquet",
+        chunk_size: int = 10000,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.state_path = os.path.join(output_dir, self.STATE_FILE)
+
+    def export(self, table: str, since: Optional[str] = None) -> ExportStats:
+        """Export rows newer than the `since` timestamp, or than the last export high-water mark"""
+        pa = _require_pyarrow()
+        spec = TABLES[table]
+        state = self.__load_state()
+        high_water_mark = state.get(table)
+        stats = ExportStats(table=table, high_water_mark=high_water_mark)
+
+        names = [name for name, _ in spec["columns"]]
+        schema = pa.schema([(name, self.__arrow_type(pa, kind)) for name, kind in spec["columns"]])
+        cursor_index = names.index(spec["cursor"])
+        time_index = names.index(spec["time"])
+        run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+
+        where, params = self.__where(spec, since, high_water_mark)
+        query = f"SELECT {', '.join(names)} FROM {table}{where} ORDER BY {spec['cursor']}"
+
+        writer, day = None, None
+        # Read-only connection, safe next to the live bot writing the database
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                for chunk_day, day_rows in self.__split_by_day(rows, time_index):
+                    if chunk_day != day:
+                        if writer:
+                            writer.close()
+                        writer = self.__open_writer(pa, schema, table, chunk_day, run_id)
+                        day = chunk_day
+                        stats.files += 1
+                    writer.write_table(self.__to_table(pa, schema, spec["columns"], day_rows))
+                stats.rows += len(rows)
+                stats.high_water_mark = rows[-1][cursor_index]
+        finally:
+            if writer:
+                writer.close()
+            conn.close()
+
+        if stats.high_water_mark is not None:
+            state[table] = stats.high_water_mark
+            self.__save_state(state)
+        logging.info(f"Exported {stats.rows} {table} rows to {stats.files} files")
+        return stats
+
+    @staticmethod
+    def __where(spec: Dict, since: Optional[str], high_water_mark) -> Tuple[str, Tuple]:
+        """Filter on the `since` timestamp when given, else past the high-water mark"""
+        if since is None and isinstance(high_water_mark, str) and spec["cursor"] != spec["time"]:
+            since = high_water_mark  # saved before the table had an id cursor
+        if since is not None:
+            return (f" WHERE {spec['time']} > ?", (since,)) if since else ("", ())
+        if high_water_mark is not None:
+            return f" WHERE {spec['cursor']} > ?", (high_water_mark,)
+        return "", ()
+
+    @staticmethod
+    def __split_by_day(rows: List[tuple], time_index: int):
+        """Group consecutive rows, ordered by time, by their ISO day"""
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i][time_index][:10] != rows[start][time_index][:10]:
+                yield rows[start][time_index][:10], rows[start:i]
+                start = i
+
+    def __open_writer(self, pa, schema, table: str, day: str, run_id: str):
+        directory = os.path.join(self.output_dir, table, f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{run_id}.{self.fmt}")
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(path, schema)
+        import pyarrow.ipc as ipc
+
+        return ipc.new_file(path, schema)
+
+    @staticmethod
+    def __to_table(pa, schema, columns, rows: List[tuple]):
+        arrays = []
+        for (name, kind), values in zip(columns, zip(*rows)):
+            if kind == "bool":
+                values = [None if v is None else bool(v) for v in values]
+            if kind == "timestamp":
+                arrays.append(pa.array(values, pa.string()).cast(schema.field(name).type))
+            else:
+                arrays.append(pa.array(values, schema.field(name).type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def __arrow_type(pa, kind: str):
+        if kind == "timestamp":
+            return pa.timestamp("us")
+        if kind == "bool":
+            return pa.bool_()
+        return getattr(pa, kind)()
+
+    def __load_state(self) -> Dict[str, Union[str, int]]:
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def __save_state(self, state: Dict[str, Union[str, int]]):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=4)
+        os.replace(tmp_path, self.state_path)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export bot tables to Parquet or Arrow IPC")
+    parser.add_argument("--db", default="dist/dexscreener_data.db", help="SQLite database")
+    parser.add_argument("--out", default="dist/export", help="Output directory")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--table", choices=sorted(TABLES), action="append")
+    parser.add_argument("--since", help="Export rows after this ISO timestamp")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    exporter = TableExporter(args.db, args.out, args.format, args.chunk_size)
+    for table in args.table or sorted(TABLES):
+        stats = exporter.export(table, since=args.since)
+        print(f"{table}: {stats.rows} rows, {stats.files} files, up to {stats.high_water_mark}")
+
+
+if __name__ == "__main__":
+    main()
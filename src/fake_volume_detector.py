@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .rolling_window import RollingWindow
+
+TIMEFRAMES = ("m5", "h1", "h6")
+
+
+class _TokenActivity:
+    """Ring buffers of txns and volume snapshots for one token"""
+
+    __slots__ = ("buys", "sells", "volume", "trade_size", "pushed_at")
+
+    def __init__(self, window: int):
+        self.buys = {tf: RollingWindow(window) for tf in TIMEFRAMES}
+        self.sells = {tf: RollingWindow(window) for tf in TIMEFRAMES}
+        self.volume = {tf: RollingWindow(window) for tf in TIMEFRAMES}
+        self.trade_size = RollingWindow(window)
+        self.pushed_at = float("-inf")
+
+
+class FakeVolumeDetector:
+    """Flag wash trading from rolling txns and volume statistics across cycles
+
+    A snapshot is only recorded when its m5 txns or volume changed, or once
+    `min_interval` seconds passed: cycles shorter than 5 minutes would
+    otherwise record the same m5 window several times.
+    """
+
+    def __init__(
+        self,
+        repetitive_trade_threshold: float = 0.9,
+        min_unique_wallets: int = 10,
+        max_trade_size_variation: float = 0.1,
+        window: int = 12,
+        min_samples: int = 3,
+        min_signals: int = 2,
+        max_tokens: int = 5000,
+        min_interval: float = 300,
+    ):
+        self.repetitive_trade_threshold = repetitive_trade_threshold
+        self.min_unique_wallets = min_unique_wallets
+        self.max_trade_size_variation = max_trade_size_variation
+        self.window = window
+        self.min_samples = min_samples
+        self.min_signals = min_signals
+        self.max_tokens = max_tokens
+        self.min_interval = min_interval
+        self._tokens: "OrderedDict[str, _TokenActivity]" = OrderedDict()
+
+    def update(self, address: str, token_data: dict, timestamp: Optional[float] = None):
+        """Record the txns and volume snapshot of a pair payload"""
+        activity = self._tokens.get(address)
+        if activity is None:
+            activity = self._tokens[address] = _TokenActivity(self.window)
+            if len(self._tokens) > self.max_tokens:
+                self._tokens.popitem(last=False)
+        else:
+            self._tokens.move_to_end(address)
+
+        txns = token_data.get("txns") or {}
+        volume = token_data.get("volume") or {}
+        now = time.monotonic() if timestamp is None else timestamp
+        m5 = txns.get("m5") or {}
+        unchanged = len(activity.volume["m5"]) and (
+            activity.buys["m5"].last == self.__safe_float(m5.get("buys"))
+            and activity.sells["m5"].last == self.__safe_float(m5.get("sells"))  # noqa: W503
+            and activity.volume["m5"].last == self.__safe_float(volume.get("m5"))  # noqa: W503
+        )
+        if unchanged and now - activity.pushed_at < self.min_interval:
+            return
+        activity.pushed_at = now
+        for tf in TIMEFRAMES:
+            counts = txns.get(tf) or {}
+            activity.buys[tf].push(self.__safe_float(counts.get("buys")))
+            activity.sells[tf].push(self.__safe_float(counts.get("sells")))
+            activity.volume[tf].push(self.__safe_float(volume.get(tf)))
+
+        trades = activity.buys["m5"].last + activity.sells["m5"].last
+        if trades > 0:
+            activity.trade_size.push(activity.volume["m5"].last / trades)
+
+    def signals(self, address: str) -> Dict[str, bool]:
+        """Evaluate the wash trading signals of a tracked token"""
+        activity = self._tokens.get(address)
+        if activity is None or len(activity.volume["h1"]) < self.min_samples:
+            return {}
+
+        buys, sells = activity.buys["m5"].total, activity.sells["m5"].total
+        balance = min(buys, sells) / max(buys, sells) if max(buys, sells) else 0.0
+
+        h1_trades = activity.buys["h1"].mean + activity.sells["h1"].mean
+        few_wallets = activity.volume["h1"].mean > 0 and h1_trades < self.min_unique_wallets
+
+        trade_size = activity.trade_size
+        uniform_size = (
+            len(trade_size) >= self.min_samples
+            and trade_size.coefficient_of_variation < self.max_trade_size_variation  # noqa: W503
+        )
+
+        return {
+            # Buys mirrored by sells cycle after cycle
+            "repetitive_trades": balance >= self.repetitive_trade_threshold,
+            # Real volume with too few trades to come from many wallets
+            "few_wallets": few_wallets,
+            # Average trade size barely moves between snapshots
+            "uniform_trade_size": uniform_size,
+        }
+
+    def is_suspicious(self, address: str) -> bool:
+        return sum(self.signals(address).values()) >= self.min_signals
+
+    def trim(self, max_entries: int) -> int:
+        """Forget the least recently updated tokens down to `max_entries`"""
+        evicted = max(0, len(self._tokens) - max_entries)
+        for _ in range(evicted):
+            self._tokens.popitem(last=False)
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @staticmethod
+    def __safe_float(val) -> float:
+        try:
+            return float(val)
+        except (ValueError, TypeError):
+            return 0.0
@@ -0,0 +1,56 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+
+@dataclass
+class CachedResponse:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: bytes
+    data: Any  # decoded body
+
+
+class HttpCache:
+    """Validators, body hashes and decoded bodies of polled endpoints"""
+
+    def __init__(self):
+        self._entries: Dict[str, CachedResponse] = {}
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        return self._entries.get(url)
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a cached url"""
+        entry = self._entries.get(url)
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def unchanged(self, url: str, headers: Mapping[str, str], raw: bytes) -> Optional[Any]:
+        """Cached data when a full response has the same body as the cached one"""
+        entry = self._entries.get(url)
+        if entry is None or entry.body_hash != self.body_hash(raw):
+            return None
+        # Servers may rotate validators for an identical body
+        entry.etag = headers.get("ETag")
+        entry.last_modified = headers.get("Last-Modified")
+        return entry.data
+
+    def store(self, url: str, headers: Mapping[str, str], raw: bytes, data: Any):
+        self._entries[url] = CachedResponse(
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            body_hash=self.body_hash(raw),
+            data=data,
+        )
+
+    @staticmethod
+    def body_hash(raw: bytes) -> bytes:
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
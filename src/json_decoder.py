@@ -0,0 +1,76 @@
+import asyncio
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast backend
+    orjson = None
+
+
+# Field specs describe the subset of a payload to keep. A key mapped to None is
+# kept as-is, a key mapped to a dict is projected recursively.
+DISCOVERY_FIELDS: Dict[str, Any] = {
+    "chainId": None,
+    "tokenAddress": None,
+}
+
+PAIR_FIELDS: Dict[str, Any] = {
+    "chainId": None,
+    "dexId": None,
+    "pairAddress": None,
+    "baseToken": {"address": None, "symbol": None, "name": None},
+    "priceUsd": None,
+    "priceChange": None,
+    "txns": None,
+    "volume": None,
+    "liquidity": {"usd": None},
+    "fdv": None,
+    "marketCap": None,
+    "info": {"websites": None, "socials": None},
+}
+
+
+def project(data: Any, fields: Optional[Dict[str, Any]]) -> Any:
+    """Reduce decoded JSON to the keys listed in a field spec"""
+    if fields is None:
+        return data
+    if isinstance(data, list):
+        return [project(item, fields) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    projected = {}
+    for key, sub_fields in fields.items():
+        if key in data:
+            projected[key] = project(data[key], sub_fields)
+    return projected
+
+
+class JsonDecoder:
+    """Decode HTTP payloads with a pluggable JSON backend"""
+
+    def __init__(self, backend: str = "auto", offload_threshold: int = 256 * 1024):
+        self.backend = self.__resolve_backend(backend)
+        self.offload_threshold = offload_threshold
+        self._loads = orjson.loads if self.backend == "orjson" else json.loads
+
+    def loads(self, raw: bytes, fields: Optional[Dict[str, Any]] = None) -> Any:
+        """Decode raw bytes synchronously and project them"""
+        return project(self._loads(raw), fields)
+
+    async def decode(self, raw: bytes, fields: Optional[Dict[str, Any]] = None) -> Any:
+        """Decode raw bytes, in a worker thread when the payload is large"""
+        if len(raw) >= self.offload_threshold:
+            return await asyncio.to_thread(self.loads, raw, fields)
+        return self.loads(raw, fields)
+
+    @staticmethod
+    def __resolve_backend(backend: str) -> str:
+        if backend == "auto":
+            return "orjson" if orjson is not None else "json"
+        if backend == "orjson" and orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        if backend not in ("orjson", "json"):
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        return backend
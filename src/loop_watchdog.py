@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from .rolling_window import RollingWindow
+
+
+class LoopWatchdog:
+    """Measure event loop scheduling lag and log the stack of blocking code
+
+    A task on the loop sleeps for `interval` and records how late it wakes up.
+    A helper thread watches the heartbeat of that task: once the loop has not
+    run it for `threshold` seconds, the loop thread stack is captured with
+    `sys._current_frames`, while the blocking call is still on it.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, window: int = 600):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = RollingWindow(window)
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._heartbeat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._stopped = threading.Event()
+
+    async def watch(self):
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        threading.Thread(target=self.__monitor, name="loop-watchdog", daemon=True).start()
+        try:
+            while True:
+                start = loop.time()
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, loop.time() - start - self.interval)
+                self.lags.push(lag)
+                self.max_lag = max(self.max_lag, lag)
+                self._heartbeat = time.monotonic()
+        finally:
+            self._stopped.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Lag metrics in milliseconds, over the last `window` samples"""
+        return {
+            "last_ms": round(self.lags.last * 1000, 3) if len(self.lags) else 0.0,
+            "mean_ms": round(self.lags.mean * 1000, 3),
+            "max_ms": round(self.max_lag * 1000, 3),
+            "stalls": self.stalls,
+        }
+
+    def __monitor(self):
+        reported = False
+        while not self._stopped.wait(self.interval):
+            blocked = time.monotonic() - self._heartbeat - self.interval
+            if blocked < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            # One report per stall, the heartbeat resets it
+            reported = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else "unavailable\n"
+            logging.warning(
+                f"Event loop blocked for {blocked:.3f}s, loop thread stack:\n{stack}"
+            )
@@ -0,0 +1,72 @@
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+
+@dataclass
+class _Component:
+    size: Callable[[], int]
+    trim: Optional[Callable[[int], int]]
+    cap: Optional[int]
+
+
+class MemoryBudget:
+    """Account for in-process caches and indexes and keep each within its cap
+
+    Sizes are counted in entries: the caches hold small per-token records, so
+    the entry count is what grows with uptime.
+    """
+
+    def __init__(self, caps: Optional[Dict[str, int]] = None):
+        self.caps = caps or {}
+        self._components: Dict[str, _Component] = {}
+
+    def register(
+        self,
+        name: str,
+        size: Callable[[], int],
+        trim: Optional[Callable[[int], int]] = None,
+        cap: Optional[int] = None,
+    ):
+        """Track a component, a cap configured for its name wins over `cap`
+
+        `trim(max_entries)` evicts down to `max_entries` and returns the number
+        of evicted entries. Components without one are only reported.
+        """
+        self._components[name] = _Component(size, trim, self.caps.get(name, cap))
+
+    def enforce(self) -> Dict[str, int]:
+        """Trim every component over its cap, return the evictions per component"""
+        evicted = {}
+        for name, component in self._components.items():
+            if component.trim is None or component.cap is None:
+                continue
+            if component.size() > component.cap:
+                evicted[name] = component.trim(component.cap)
+                logging.info(f"Evicted {evicted[name]} {name} entries, cap {component.cap}")
+        return evicted
+
+    def usage(self) -> Dict[str, Dict[str, Optional[int]]]:
+        """Current entries and cap of every component"""
+        return {
+            name: {"entries": component.size(), "cap": component.cap}
+            for name, component in self._components.items()
+        }
+
+    @staticmethod
+    def rss_bytes() -> Optional[int]:
+        """Resident set size of the process, None where it cannot be read"""
+        try:
+            with open("/proc/self/statm", "r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            import resource
+        except ImportError:
+            return None
+        # Peak rather than current RSS, in bytes on macOS and KB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
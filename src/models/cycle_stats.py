@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class CycleStats:
+    """Data class to store the outcome and timings of one processing cycle"""
+
+    chain_id: str
+    discovered: int = 0
+    selected: int = 0
+    processed: int = 0
+    rejected: int = 0
+    errors: int = 0
+    trades: int = 0
+    discovery_time: float = 0.0  # seconds
+    token_time_total: float = 0.0  # fetch and analysis, request_delay excluded
+    token_time_max: float = 0.0
+    duration: float = 0.0
+    intended_trades: List[Dict] = field(default_factory=list)  # dry runs only
+
+    @property
+    def token_time_mean(self) -> float:
+        tokens = self.processed + self.rejected + self.errors
+        return self.token_time_total / tokens if tokens else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.chain_id}: {self.discovered} discovered, {self.selected} selected, "
+            f"{self.processed} processed, {self.rejected} rejected, {self.errors} errors, "
+            f"{self.trades} trades "
+            f"in {self.duration:.2f}s (discovery {self.discovery_time:.2f}s, "
+            f"per token {self.token_time_mean * 1000:.0f}ms mean / "
+            f"{self.token_time_max * 1000:.0f}ms max)"
+        )
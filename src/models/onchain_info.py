@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class OnChainInfo:
+    """Data class to store on-chain mint, authority and holder information"""
+
+    mint: str
+    mint_authority: Optional[str] = None
+    freeze_authority: Optional[str] = None
+    creator: Optional[str] = None
+    supply: int = 0
+    top_holders_ratio: Optional[float] = None
+    # (owner, amount) of the largest token accounts, pool and curve accounts excluded
+    holders: List[Tuple[Optional[str], int]] = field(default_factory=list)
+    fetched_at: float = 0.0
@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass
+class Position:
+    """Data class to store an open or closed trading position"""
+
+    token_address: str
+    entry_price: float = 0.0  # average price of all buys
+    size: float = 0.0  # SOL committed
+    buys: int = 0
+    opened_at: datetime = field(default_factory=datetime.now)
+    last_buy_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    state: str = "open"
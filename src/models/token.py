@@ -12,9 +12,12 @@ class Token:
     name: str
     chain_id: str = "solana"
     dex_id: str = "auto"
-    dev_address: Optional[str] = None  # Placeholder until blockchain data is integrated
-    first_seen: datetime = datetime.now()
-    last_updated: datetime = datetime.now()
+    dev_address: Optional[str] = None  # Set from on-chain metadata when enrichment is enabled
+    mint_authority: Optional[str] = None
+    freeze_authority: Optional[str] = None
+    top_holders_ratio: Optional[float] = None
+    first_seen: datetime = field(default_factory=datetime.now)
+    last_updated: datetime = field(default_factory=datetime.now)
     max_price: float = 0.0
     min_price: float = 0.0
     current_price: float = 0.0
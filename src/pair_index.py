@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+TIMEFRAMES = ("m5", "h1", "h6", "h24")
+
+
+class PairIndex:
+    """Every known pair of each token, keyed by pair address
+
+    Tokens often trade in several pools and Dexscreener does not list the
+    deepest one first. Analysis uses the deepest pool, or liquidity-weighted
+    aggregates of all pools with `aggregate`. Each fetch replaces the pairs of
+    its token, a pool it no longer returns is gone or drained.
+    """
+
+    def __init__(self, max_tokens: int = 5000):
+        self.max_tokens = max_tokens
+        self._pairs: "OrderedDict[str, Dict[str, dict]]" = OrderedDict()
+
+    def update(self, token_address: str, pairs: List[dict]):
+        """Replace the pairs of a token with the ones returned by its last fetch"""
+        self._pairs[token_address] = {
+            pair.get("pairAddress") or f"{pair.get('dexId')}-{i}": pair
+            for i, pair in enumerate(pairs)
+        }
+        self._pairs.move_to_end(token_address)
+        if len(self._pairs) > self.max_tokens:
+            self._pairs.popitem(last=False)
+
+    def pairs(self, token_address: str) -> List[dict]:
+        return list(self._pairs.get(token_address, {}).values())
+
+    def best(self, token_address: str) -> Optional[dict]:
+        """Pair of the deepest liquidity pool"""
+        pairs = self.pairs(token_address)
+        return max(pairs, key=self.__liquidity) if pairs else None
+
+    def aggregate(self, token_address: str) -> Optional[dict]:
+        """Deepest pair with volumes and txns summed and prices weighted by liquidity"""
+        best = self.best(token_address)
+        pairs = self.pairs(token_address)
+        total_liquidity = sum(self.__liquidity(pair) for pair in pairs)
+        if best is None or len(pairs) == 1 or total_liquidity <= 0:
+            return best
+
+        def weighted(get) -> float:
+            return sum(get(pair) * self.__liquidity(pair) for pair in pairs) / total_liquidity
+
+        aggregated = dict(best)
+        aggregated["liquidity"] = {**(best.get("liquidity") or {}), "usd": total_liquidity}
+        aggregated["priceUsd"] = weighted(lambda pair: self.__safe_float(pair.get("priceUsd")))
+        aggregated["priceChange"] = {
+            tf: weighted(lambda pair: self.__safe_float((pair.get("priceChange") or {}).get(tf)))
+            for tf in TIMEFRAMES
+        }
+        aggregated["volume"] = {
+            tf: sum(self.__safe_float((pair.get("volume") or {}).get(tf)) for pair in pairs)
+            for tf in TIMEFRAMES
+        }
+        aggregated["txns"] = {
+            tf: {
+                side: sum(
+                    self.__safe_float(((pair.get("txns") or {}).get(tf) or {}).get(side))
+                    for pair in pairs
+                )
+                for side in ("buys", "sells")
+            }
+            for tf in TIMEFRAMES
+        }
+        return aggregated
+
+    def trim(self, max_entries: int) -> int:
+        """Forget the least recently updated tokens down to `max_entries`"""
+        evicted = max(0, len(self._pairs) - max_entries)
+        for _ in range(evicted):
+            self._pairs.popitem(last=False)
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    @classmethod
+    def __liquidity(cls, pair: dict) -> float:
+        return cls.__safe_float((pair.get("liquidity") or {}).get("usd"))
+
+    @staticmethod
+    def __safe_float(val) -> float:
+        try:
+            return float(val)
+        except (ValueError, TypeError):
+            return 0.0
@@ -0,0 +1,243 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import struct
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from .solana_rpc import PUMP_FUN, SolanaRpcClient
+
+RAYDIUM_AMM_V4 = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+# Quote side of new pools, never the token being launched
+QUOTE_MINTS = {
+    "So11111111111111111111111111111111111111112",
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+}
+# Anchor event discriminator: first 8 bytes of sha256("event:<Name>")
+PUMP_CREATE_EVENT = hashlib.sha256(b"event:CreateEvent").digest()[:8]
+
+
+def decode_pump_create_event(data: bytes) -> Optional[Dict[str, str]]:
+    """Decode a pump.fun CreateEvent, None for any other event"""
+    if data[:8] != PUMP_CREATE_EVENT:
+        return None
+    from solders.pubkey import Pubkey
+
+    event = {}
+    offset = 8
+    try:
+        # Borsh strings: u32 length prefix, then UTF-8 bytes
+        for field in ("name", "symbol", "uri"):
+            (length,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            if offset + length > len(data):
+                return None
+            event[field] = data[offset:offset + length].decode("utf-8", errors="replace")
+            offset += length
+    except struct.error:
+        return None
+    for field in ("mint", "bonding_curve", "user"):
+        if offset + 32 > len(data):
+            return None
+        event[field] = str(Pubkey.from_bytes(data[offset:offset + 32]))
+        offset += 32
+    return event
+
+
+def raydium_pool_mints(transaction: Optional[dict]) -> List[str]:
+    """Token mints of the Raydium AMM v4 initialize2 of a jsonParsed transaction"""
+    if not transaction:
+        return []
+    message = transaction.get("transaction", {}).get("message", {})
+    instructions = list(message.get("instructions", []))
+    for inner in (transaction.get("meta") or {}).get("innerInstructions") or []:
+        instructions.extend(inner.get("instructions", []))
+
+    mints = []
+    for instruction in instructions:
+        accounts = instruction.get("accounts") or []
+        # initialize2 accounts 8 and 9 are the coin and pc mints
+        if instruction.get("programId") == RAYDIUM_AMM_V4 and len(accounts) > 9:
+            mints += [mint for mint in accounts[8:10] if mint not in QUOTE_MINTS]
+    return mints
+
+
+class PoolListener:
+    """Discover new Raydium and pump.fun pools from Solana websocket log subscriptions
+
+    Mints wait in a pending queue until the bot found their pair on
+    Dexscreener, which lists new pools with some delay, or until they were
+    handed out `max_attempts` times. The queue keeps the `max_pending` newest
+    mints.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        rpc_url: Optional[str] = None,
+        rpc: Optional[SolanaRpcClient] = None,
+        programs: Iterable[str] = (RAYDIUM_AMM_V4, PUMP_FUN),
+        max_attempts: int = 5,
+        max_seen: int = 10000,
+        max_pending: int = 1000,
+        reconnect_delay: float = 5,
+    ):
+        self.ws_url = ws_url
+        self.programs = list(programs)
+        self.max_attempts = max_attempts
+        self.max_seen = max_seen
+        self.max_pending = max_pending
+        self.reconnect_delay = reconnect_delay
+        self._owns_rpc = rpc is None
+        self.rpc = rpc or SolanaRpcClient(rpc_url or ws_url.replace("ws", "http", 1))
+        self._pending: "OrderedDict[str, int]" = OrderedDict()  # mint -> attempts
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lookups = set()
+
+    async def listen(self):
+        """Keep the subscriptions open, reconnecting after errors"""
+        while True:
+            try:
+                await self.__listen_once()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logging.error(f"Pool listener error on {self.ws_url}: {e}")
+            except Exception:
+                # Anything else would end the background task silently for good
+                logging.exception(f"Pool listener failure on {self.ws_url}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def __listen_once(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.ws_url, heartbeat=30) as ws:
+                for i, program in enumerate(self.programs):
+                    await ws.send_json(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": i,
+                            "method": "logsSubscribe",
+                            "params": [{"mentions": [program]}, {"commitment": "confirmed"}],
+                        }
+                    )
+                subscriptions = {}
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    try:
+                        message = json.loads(msg.data)
+                    except ValueError:
+                        continue
+                    if "id" in message and "result" in message:
+                        subscriptions[message["result"]] = self.programs[message["id"]]
+                    elif message.get("method") == "logsNotification":
+                        try:
+                            params = message["params"]
+                            program = subscriptions.get(params.get("subscription"))
+                            self.handle_logs(program, params["result"]["value"])
+                        except (KeyError, TypeError, AttributeError) as e:
+                            logging.warning(f"Malformed pool listener notification: {e!r}")
+        logging.warning(f"Pool listener connection to {self.ws_url} closed")
+
+    def handle_logs(self, program: Optional[str], value: Dict):
+        """Extract new pool mints from the logs of one transaction"""
+        if value.get("err"):
+            return
+        logs = value.get("logs") or []
+        if program == PUMP_FUN:
+            for line in logs:
+                if not line.startswith("Program data: "):
+                    continue
+                try:
+                    event = decode_pump_create_event(base64.b64decode(line[14:]))
+                except (ValueError, binascii.Error):
+                    continue
+                if event:
+                    self.push(event["mint"], "pump.fun")
+        elif program == RAYDIUM_AMM_V4 and any("initialize2" in line for line in logs):
+            # The mints are not in the logs, read them from the transaction
+            task = asyncio.create_task(self.__lookup_raydium(value["signature"]))
+            self._lookups.add(task)
+            task.add_done_callback(self._lookups.discard)
+
+    async def __lookup_raydium(self, signature: str):
+        options = {
+            "encoding": "jsonParsed",
+            "maxSupportedTransactionVersion": 0,
+            "commitment": "confirmed",
+        }
+        try:
+            (transaction,) = await self.rpc.call_batch([("getTransaction", [signature, options])])
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logging.error(f"Could not fetch Raydium pool transaction {signature}: {e}")
+            return
+        for mint in raydium_pool_mints(transaction):
+            self.push(mint, "raydium")
+
+    def push(self, mint: str, source: str):
+        if mint in self._seen:
+            return
+        self._seen[mint] = None
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        self._pending[mint] = 0
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+        logging.info(f"New {source} pool for {mint}")
+
+    def pending(self) -> List[str]:
+        """Mints to analyze this cycle, oldest first"""
+        mints = []
+        for mint, attempts in list(self._pending.items()):
+            if attempts >= self.max_attempts:
+                del self._pending[mint]
+                continue
+            self._pending[mint] = attempts + 1
+            mints.append(mint)
+        return mints
+
+    def fresh(self, limit: Optional[int] = None) -> List[str]:
+        """Mints pushed since the last hand out, to analyze in the cycle in progress
+
+        Only the `limit` oldest are handed out, the others wait for the next cycle.
+        """
+        mints = [mint for mint, attempts in self._pending.items() if attempts == 0]
+        mints = mints[:limit]
+        for mint in mints:
+            self._pending[mint] = 1
+        return mints
+
+    def resolve(self, mint: str):
+        """Stop handing out a mint once its pair was found"""
+        self._pending.pop(mint, None)
+
+    def trim(self, max_entries: int) -> int:
+        """Forget the oldest seen mints down to `max_entries`"""
+        evicted = max(0, len(self._seen) - max_entries)
+        for _ in range(evicted):
+            self._seen.popitem(last=False)
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def trim_pending(self, max_entries: int) -> int:
+        """Drop the oldest pending mints down to `max_entries`"""
+        evicted = max(0, len(self._pending) - max_entries)
+        for _ in range(evicted):
+            self._pending.popitem(last=False)
+        return evicted
+
+    async def close(self):
+        for task in list(self._lookups):
+            task.cancel()
+        await asyncio.gather(*self._lookups, return_exceptions=True)
+        if self._owns_rpc:
+            await self.rpc.close()
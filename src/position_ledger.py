@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from .database import Database
+from .models.position import Position
+
+
+class PositionLedger:
+    """In-memory index of positions, persisted write-behind to the database"""
+
+    def __init__(self, database: Database, max_exposure: float, cooldown: float = 3600):
+        self.database = database
+        self.max_exposure = max_exposure
+        self.cooldown = timedelta(seconds=cooldown)
+        self._positions: Dict[str, Position] = {}
+        self._dirty = set()
+
+    def load(self):
+        """Load every position once, at startup"""
+        self._positions = {p.token_address: p for p in self.database.load_positions()}
+        logging.info(f"Loaded {len(self._positions)} positions")
+
+    def get(self, address: str) -> Optional[Position]:
+        return self._positions.get(address)
+
+    def can_buy(self, address: str, amount: float) -> bool:
+        """Check exposure and cooldown of a token before buying it"""
+        position = self._positions.get(address)
+        if position is None or position.state != "open":
+            return amount <= self.max_exposure
+        if position.size + amount > self.max_exposure:
+            return False
+        return datetime.now() - position.last_buy_at >= self.cooldown
+
+    def record_buy(self, address: str, price: float, amount: float):
+        now = datetime.now()
+        position = self._positions.get(address)
+        if position is None or position.state != "open":
+            position = self._positions[address] = Position(
+                token_address=address, opened_at=now
+            )
+        if price > 0:
+            # Average the entry price by the SOL committed on each buy
+            position.entry_price = (
+                position.entry_price * position.size + price * amount
+            ) / (position.size + amount)
+        position.size += amount
+        position.buys += 1
+        position.last_buy_at = now
+        position.updated_at = now
+        self._dirty.add(address)
+
+    def close(self, address: str):
+        """Mark a position as closed, for exit logic"""
+        position = self._positions.get(address)
+        if position is None or position.state == "closed":
+            return
+        position.state = "closed"
+        position.updated_at = datetime.now()
+        self._dirty.add(address)
+
+    def flush(self):
+        """Write positions changed since the last flush"""
+        if not self._dirty:
+            return
+        self.database.save_positions([self._positions[a] for a in self._dirty])
+        self._dirty.clear()
+
+    def trim(self, max_entries: int) -> int:
+        """Forget the oldest closed positions, already saved, down to `max_entries`
+
+        Open positions are never evicted, a forgotten closed position allows
+        the same buys as a missing one.
+        """
+        closed = sorted(
+            (
+                p
+                for p in self._positions.values()
+                if p.state == "closed" and p.token_address not in self._dirty
+            ),
+            key=lambda p: p.updated_at,
+        )
+        evicted = closed[: max(0, len(self._positions) - max_entries)]
+        for position in evicted:
+            del self._positions[position.token_address]
+        return len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._positions)
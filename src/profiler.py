@@ -0,0 +1,62 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tracemalloc
+from datetime import datetime
+from typing import Awaitable, Optional
+
+
+class CycleProfiler:
+    """Capture cProfile stats and tracemalloc snapshots for the next N cycles"""
+
+    def __init__(self, output_dir: str = "dist/profiles", cycles: int = 5, top: int = 15):
+        self.output_dir = output_dir
+        self.cycles = cycles
+        self.top = top
+        self.remaining = 0
+        self._owns_tracemalloc = False
+
+    @property
+    def active(self) -> bool:
+        return self.remaining > 0
+
+    def arm(self, cycles: Optional[int] = None):
+        """Profile the next cycles, started from a signal or a config change"""
+        self.remaining = cycles or self.cycles
+        logging.info(f"Profiling armed for the next {self.remaining} cycles")
+
+    async def profile(self, cycle: Awaitable):
+        """Run one cycle under cProfile and tracemalloc, then write the reports"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        baseline = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return await cycle
+        finally:
+            profile.disable()
+            snapshot = tracemalloc.take_snapshot()
+            self.remaining -= 1
+            if not self.active and self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+            self.__report(profile, baseline, snapshot)
+
+    def __report(self, profile: cProfile.Profile, baseline, snapshot):
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, datetime.now().strftime("cycle-%Y%m%dT%H%M%S%f"))
+        profile.dump_stats(f"{prefix}.pstats")
+        snapshot.dump(f"{prefix}.tracemalloc")
+
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(self.top)
+        logging.info(f"Cycle profile written to {prefix}.pstats\n{stream.getvalue()}")
+
+        allocations = snapshot.compare_to(baseline, "lineno")[: self.top]
+        logging.info(
+            "Top allocation sites:\n" + "\n".join(str(stat) for stat in allocations)
+        )
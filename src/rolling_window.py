@@ -0,0 +1,72 @@
+import math
+from array import array
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of floats with O(1) running statistics"""
+
+    __slots__ = ("_values", "_index", "_count", "_sum", "_sum_sq")
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError("RollingWindow size must be positive")
+        self._values = array("d", bytes(8 * size))
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def push(self, value: float):
+        """Add a value, evicting the oldest one once the buffer is full"""
+        if self._count == len(self._values):
+            old = self._values[self._index]
+            self._sum -= old
+            self._sum_sq -= old * old
+        else:
+            self._count += 1
+        self._values[self._index] = value
+        self._sum += value
+        self._sum_sq += value * value
+        self._index = (self._index + 1) % len(self._values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        return len(self._values)
+
+    @property
+    def total(self) -> float:
+        return self._sum
+
+    @property
+    def last(self) -> float:
+        return self._values[self._index - 1] if self._count else 0.0
+
+    def ago(self, steps: int) -> float:
+        """Value pushed `steps` updates before the last one"""
+        if steps >= self._count:
+            raise IndexError("Not enough values in window")
+        return self._values[(self._index - 1 - steps) % len(self._values)]
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def variance(self) -> float:
+        if self._count < 2:
+            return 0.0
+        mean = self.mean
+        # Clamp float drift from the running sums
+        return max(self._sum_sq / self._count - mean * mean, 0.0)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def coefficient_of_variation(self) -> float:
+        mean = self.mean
+        return self.std / mean if mean else 0.0
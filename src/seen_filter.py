@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+import time
+from typing import List, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys"""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @staticmethod
+    def optimal_size(capacity: int, error_rate: float):
+        """Number of bits and hash functions for a capacity and false positive rate"""
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return num_bits, num_hashes
+
+    def __positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        # Double hashing, Kirsch-Mitzenmacher
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        for position in self.__positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self.__positions(key))
+
+
+class RotatingBloomFilter:
+    """Time-windowed "recently seen" set built from rotating Bloom filters
+
+    Keys are added to the newest generation and looked up in all of them. Every
+    `window` seconds the oldest generation is dropped, so a key is forgotten
+    between (generations - 1) and `generations` windows after it was added.
+    """
+
+    MAGIC = b"RBF1"
+    HEADER = struct.Struct("<4sQIIdd")
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        window: float = 3600,
+        generations: int = 2,
+        max_bytes: Optional[int] = None,
+    ):
+        self.window = window
+        self.num_bits, self.num_hashes = BloomFilter.optimal_size(capacity, error_rate)
+        if max_bytes and self.num_bits * generations > max_bytes * 8:
+            self.num_bits = max_bytes * 8 // generations
+            self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+            logging.warning(
+                f"Rejected filter capped at {max_bytes} bytes, false positive rate is now "
+                f"{self.false_positive_rate(capacity):.4f}"
+            )
+        self.generations: List[BloomFilter] = [
+            BloomFilter(self.num_bits, self.num_hashes) for _ in range(generations)
+        ]
+        self.rotated_at = time.time()
+
+    def false_positive_rate(self, count: int) -> float:
+        """Expected false positive rate of one generation holding `count` keys"""
+        return (1 - math.exp(-self.num_hashes * count / self.num_bits)) ** self.num_hashes
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(generation.bits) for generation in self.generations)
+
+    def add(self, key: str):
+        self.__rotate()
+        self.generations[0].add(key)
+
+    def __contains__(self, key: str) -> bool:
+        self.__rotate()
+        return any(key in generation for generation in self.generations)
+
+    def __rotate(self):
+        now = time.time()
+        elapsed = int((now - self.rotated_at) // self.window)
+        if elapsed <= 0:
+            return
+        for _ in range(min(elapsed, len(self.generations))):
+            self.generations.pop()
+            self.generations.insert(0, BloomFilter(self.num_bits, self.num_hashes))
+        self.rotated_at += elapsed * self.window
+
+    def save(self, path: str):
+        """Persist the filter atomically"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                self.HEADER.pack(
+                    self.MAGIC,
+                    self.num_bits,
+                    self.num_hashes,
+                    len(self.generations),
+                    self.window,
+                    self.rotated_at,
+                )
+            )
+            for generation in self.generations:
+                f.write(generation.bits)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """Restore a saved filter if it matches the current sizing"""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(self.HEADER.size)
+                magic, num_bits, num_hashes, generations, window, rotated_at = (
+                    self.HEADER.unpack(header)
+                )
+                if (magic, num_bits, num_hashes, generations, window) != (
+                    self.MAGIC,
+                    self.num_bits,
+                    self.num_hashes,
+                    len(self.generations),
+                    self.window,
+                ):
+                    logging.info(f"Rejected filter settings changed, ignoring {path}")
+                    return False
+                size = (num_bits + 7) // 8
+                bits = [bytearray(f.read(size)) for _ in range(generations)]
+                if any(len(generation) != size for generation in bits):
+                    raise OSError("file is truncated")
+        except FileNotFoundError:
+            return False
+        except (OSError, struct.error) as e:
+            logging.error(f"Could not load rejected filter {path}: {e}")
+            return False
+        self.generations = [BloomFilter(num_bits, num_hashes, b) for b in bits]
+        self.rotated_at = rotated_at
+        return True
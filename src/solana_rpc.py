@@ -0,0 +1,259 @@
+import asyncio
+import base64
+import logging
+import struct
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from .models.onchain_info import OnChainInfo
+
+TOKEN_METADATA_PROGRAM = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
+PUMP_FUN = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+# Owners of AMM vaults, their balance is pool liquidity, not a holder
+POOL_AUTHORITIES = {
+    "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1",  # Raydium AMM v4
+    "GpMZbSM2GgvTKHJirzeGfMFoaZ8UR2X7F4v8vHTvxFbL",  # Raydium CPMM
+}
+
+
+class SolanaRpcClient:
+    """Batched Solana JSON-RPC client with a per-mint enrichment cache"""
+
+    def __init__(
+        self,
+        rpc_url: str,
+        batch_size: int = 100,
+        pool_size: int = 4,
+        cache_ttl: float = 300,
+        top_holders: int = 10,
+        ignored_creators: Iterable[str] = (),
+        timeout: float = 10,
+    ):
+        self.rpc_url = rpc_url
+        self.batch_size = batch_size
+        self.pool_size = pool_size
+        self.cache_ttl = cache_ttl
+        self.top_holders = top_holders
+        self.ignored_creators = set(ignored_creators)
+        self.timeout = timeout
+        self._cache: Dict[str, OnChainInfo] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def get(self, mint: str) -> Optional[OnChainInfo]:
+        """Return cached on-chain info for a mint, if still fresh"""
+        info = self._cache.get(mint)
+        if info is None or time.monotonic() - info.fetched_at > self.cache_ttl:
+            return None
+        return info
+
+    async def prefetch(self, mints: Iterable[str]) -> None:
+        """Fetch on-chain info for every uncached mint in batched RPC calls"""
+        missing = {}
+        for mint in dict.fromkeys(mints):
+            if self.get(mint) is None:
+                metadata_address = self.__metadata_address(mint)
+                if metadata_address:
+                    missing[mint] = metadata_address
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            try:
+                for info in await self.__fetch_chunk(chunk):
+                    self._cache[info.mint] = info
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logging.error(f"Solana RPC error for {len(chunk)} mints: {e}")
+
+    def holders_ratio(
+        self, info: OnChainInfo, excluded_owners: Iterable[str] = ()
+    ) -> Optional[float]:
+        """Supply share of the top holders, leaving out accounts of `excluded_owners`
+
+        Pools that are not owned by a known AMM authority (CLMM, PumpSwap)
+        are owned by the pool account itself, the pair address.
+        """
+        if not info.holders or info.supply <= 0:
+            return None
+        excluded = set(excluded_owners)
+        amounts = [amount for owner, amount in info.holders if owner not in excluded]
+        return sum(sorted(amounts, reverse=True)[:self.top_holders]) / info.supply
+
+    def trim(self, max_entries: int) -> int:
+        """Drop expired entries, then the oldest ones, down to `max_entries`"""
+        now = time.monotonic()
+        by_age = sorted(self._cache.values(), key=lambda info: info.fetched_at)
+        # Expired entries are the oldest ones
+        expired = sum(1 for info in by_age if now - info.fetched_at > self.cache_ttl)
+        evicted = by_age[: max(expired, len(by_age) - max_entries)]
+        for info in evicted:
+            del self._cache[info.mint]
+        return len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def call_batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """Send several JSON-RPC calls in a single HTTP request"""
+        if not calls:
+            return []
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        session = self.__get_session()
+        async with session.post(self.rpc_url, json=payload) as response:
+            response.raise_for_status()
+            replies = await response.json(content_type=None)
+
+        if isinstance(replies, dict):
+            # Some servers answer a rejected batch with a single error object
+            raise ValueError(replies.get("error", replies))
+
+        results: List[Any] = [None] * len(calls)
+        for reply in replies:
+            if "error" in reply:
+                logging.warning(f"Solana RPC call {reply.get('id')} failed: {reply['error']}")
+                continue
+            results[reply["id"]] = reply.get("result")
+        return results
+
+    async def __fetch_chunk(self, chunk: List[Tuple[str, str]]) -> List[OnChainInfo]:
+        """Fetch mints, metadata and largest holders of a chunk, then the holders' owners"""
+        mints = [mint for mint, _ in chunk]
+        calls = [
+            ("getMultipleAccounts", [mints, {"encoding": "jsonParsed"}]),
+            ("getMultipleAccounts", [[address for _, address in chunk], {"encoding": "base64"}]),
+        ]
+        calls += [("getTokenLargestAccounts", [mint]) for mint in mints]
+
+        results = await self.call_batch(calls)
+        mint_accounts = self.__values(results[0], len(mints))
+        metadata_accounts = self.__values(results[1], len(mints))
+        largest = [(results[2 + i] or {}).get("value") or [] for i in range(len(mints))]
+        owners = await self.__fetch_owners(
+            [account["address"] for accounts in largest for account in accounts]
+        )
+        now = time.monotonic()
+
+        infos = []
+        for i, mint in enumerate(mints):
+            info = OnChainInfo(mint=mint, fetched_at=now)
+            self.__parse_mint_account(info, mint_accounts[i])
+            info.creator = self.__parse_creator(metadata_accounts[i])
+            if info.creator in self.ignored_creators:
+                info.creator = None
+            excluded = POOL_AUTHORITIES | {self.__bonding_curve_address(mint)}
+            info.holders = [
+                (owners.get(account["address"]), int(account["amount"]))
+                for account in largest[i]
+                if owners.get(account["address"]) not in excluded
+            ]
+            info.top_holders_ratio = self.holders_ratio(info)
+            infos.append(info)
+        return infos
+
+    async def __fetch_owners(self, addresses: List[str]) -> Dict[str, str]:
+        """Owners of token accounts, read in one batch of getMultipleAccounts"""
+        calls = [
+            ("getMultipleAccounts", [addresses[start:start + 100], {"encoding": "jsonParsed"}])
+            for start in range(0, len(addresses), 100)  # RPC limit per call
+        ]
+        owners = {}
+        for start, result in zip(range(0, len(addresses), 100), await self.call_batch(calls)):
+            chunk = addresses[start:start + 100]
+            for address, account in zip(chunk, self.__values(result, len(chunk))):
+                try:
+                    owners[address] = account["data"]["parsed"]["info"]["owner"]
+                except (KeyError, TypeError):
+                    continue
+        return owners
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    @staticmethod
+    def __values(result: Optional[dict], count: int) -> List[Optional[dict]]:
+        values = (result or {}).get("value") or []
+        return list(values) + [None] * (count - len(values))
+
+    @staticmethod
+    def __metadata_address(mint: str) -> Optional[str]:
+        from solders.pubkey import Pubkey
+
+        try:
+            program = Pubkey.from_string(TOKEN_METADATA_PROGRAM)
+            seeds = [b"metadata", bytes(program), bytes(Pubkey.from_string(mint))]
+        except ValueError:
+            # Not a valid Solana address, nothing to look up on-chain
+            return None
+        return str(Pubkey.find_program_address(seeds, program)[0])
+
+    @staticmethod
+    def __bonding_curve_address(mint: str) -> Optional[str]:
+        """pump.fun bonding curve of a mint, it holds the unsold supply"""
+        from solders.pubkey import Pubkey
+
+        try:
+            seeds = [b"bonding-curve", bytes(Pubkey.from_string(mint))]
+        except ValueError:
+            return None
+        return str(Pubkey.find_program_address(seeds, Pubkey.from_string(PUMP_FUN))[0])
+
+    @staticmethod
+    def __parse_mint_account(info: OnChainInfo, account: Optional[dict]):
+        try:
+            parsed = account["data"]["parsed"]["info"]
+        except (KeyError, TypeError):
+            return
+        info.mint_authority = parsed.get("mintAuthority")
+        info.freeze_authority = parsed.get("freezeAuthority")
+        info.supply = int(parsed.get("supply", 0))
+
+    @staticmethod
+    def __parse_creator(account: Optional[dict]) -> Optional[str]:
+        """Read the first verified creator from a Metaplex metadata account
+
+        The update authority is not the developer: launchpads share one for
+        all their tokens and revoked ones share a placeholder. A verified
+        creator signed the metadata, None when there is none.
+        """
+        from solders.pubkey import Pubkey
+
+        try:
+            data = base64.b64decode(account["data"][0])
+        except (KeyError, TypeError, IndexError, ValueError):
+            return None
+        # Layout: key (u8), update_authority (32 bytes), mint (32 bytes),
+        # name, symbol, uri (Borsh strings), seller_fee_basis_points (u16),
+        # creators (Option<Vec<(address, verified, share)>>)
+        offset = 65
+        try:
+            for _ in range(3):
+                (length,) = struct.unpack_from("<I", data, offset)
+                offset += 4 + length
+            offset += 2
+            (has_creators,) = struct.unpack_from("<B", data, offset)
+            if not has_creators:
+                return None
+            (count,) = struct.unpack_from("<I", data, offset + 1)
+            offset += 5
+            for _ in range(count):
+                address, verified, _share = struct.unpack_from("<32sBB", data, offset)
+                if verified:
+                    return str(Pubkey.from_bytes(address))
+                offset += 34
+        except struct.error:
+            return None
+        return None
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from .rolling_window import RollingWindow
+
+
+@dataclass(frozen=True)
+class MomentumSignals:
+    momentum: float  # % price change over the lookback
+    acceleration: float  # change of momentum since the previous observation
+    volume_surge: float  # last 5 minutes volume relative to its recent average
+    observations: int
+    span: float  # seconds covered by the momentum lookback
+
+
+class _Series:
+    """Fixed-size observation buffers of one token"""
+
+    __slots__ = ("timestamp", "price", "volume_m5", "momentum")
+
+    def __init__(self, capacity: int):
+        self.timestamp = RollingWindow(capacity)
+        self.price = RollingWindow(capacity)
+        self.volume_m5 = RollingWindow(capacity)
+        self.momentum = RollingWindow(2)
+
+
+class TimeSeriesStore:
+    """In-memory per-token price and volume series with momentum signals"""
+
+    def __init__(self, capacity: int = 30, lookback: int = 5, max_tokens: int = 5000):
+        self.capacity = capacity
+        self.lookback = min(lookback, capacity - 1)
+        self.max_tokens = max_tokens
+        self._series: "OrderedDict[str, _Series]" = OrderedDict()
+
+    def record(
+        self, address: str, token_data: dict, timestamp: Optional[float] = None
+    ) -> MomentumSignals:
+        """Append an observation from a pair payload and return updated signals"""
+        series = self._series.get(address)
+        if series is None:
+            series = self._series[address] = _Series(self.capacity)
+            if len(self._series) > self.max_tokens:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(address)
+
+        price_change = token_data.get("priceChange") or {}
+        volume = token_data.get("volume") or {}
+        volume_m5 = self.__safe_float(volume.get("m5"))
+
+        series.timestamp.push(time.time() if timestamp is None else timestamp)
+        series.price.push(self.__safe_float(token_data.get("priceUsd")))
+        series.volume_m5.push(volume_m5)
+
+        count = len(series.price)
+        steps = min(self.lookback, count - 1)
+        start_price = series.price.ago(steps)
+        if steps > 0 and start_price > 0:
+            momentum = (series.price.last / start_price - 1) * 100
+        else:
+            # First sighting, seed from the payload short-horizon change
+            momentum = self.__safe_float(price_change.get("m5"))
+        series.momentum.push(momentum)
+        span = series.timestamp.last - series.timestamp.ago(steps)
+
+        if len(series.momentum) > 1:
+            acceleration = momentum - series.momentum.ago(1)
+        else:
+            # 5 minutes change against the average 5 minutes change of the hour
+            acceleration = momentum - self.__safe_float(price_change.get("h1")) / 12
+
+        if count >= 3:
+            baseline = series.volume_m5.mean
+        else:
+            baseline = self.__safe_float(volume.get("h1")) / 12
+        volume_surge = volume_m5 / baseline if baseline > 0 else 0.0
+
+        return MomentumSignals(momentum, acceleration, volume_surge, count, span)
+
+    def trim(self, max_entries: int) -> int:
+        """Forget the least recently updated tokens down to `max_entries`"""
+        evicted = max(0, len(self._series) - max_entries)
+        for _ in range(evicted):
+            self._series.popitem(last=False)
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    @staticmethod
+    def __safe_float(val) -> float:
+        try:
+            return float(val)
+        except (ValueError, TypeError):
+            return 0.0
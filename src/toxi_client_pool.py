@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List
+
+from telethon.errors import FloodWaitError
+
+from .toxi_bot_client import ToxiBotClient
+
+
+class _Account:
+    __slots__ = ("client", "outstanding", "allocated", "blocked_until")
+
+    def __init__(self, client: ToxiBotClient):
+        self.client = client
+        self.outstanding = 0  # commands in flight
+        self.allocated = 0.0  # SOL sent in buy commands
+        self.blocked_until = 0.0  # monotonic time the flood wait ends
+
+
+class ToxiClientPool:
+    """Spread Toxi commands over several Telegram accounts
+
+    Every command goes to the account with the fewest commands in flight, then
+    the least SOL allocated. An account hitting a Telegram flood wait is set
+    aside until the wait is over and the command is retried on another one.
+    """
+
+    def __init__(self, clients: List[ToxiBotClient], max_flood_wait: float = 30):
+        self.accounts = [_Account(client) for client in clients]
+        self.max_flood_wait = max_flood_wait
+
+    async def setup(self):
+        # Logins may prompt for a code, one account at a time
+        for account in self.accounts:
+            await account.client.setup()
+
+    async def connect(self) -> None:
+        await asyncio.gather(*[account.client.connect() for account in self.accounts])
+
+    async def stop(self) -> None:
+        await asyncio.gather(
+            *[account.client.stop() for account in self.accounts], return_exceptions=True
+        )
+
+    async def send_buy_command(self, token_mint: str, buy_amount: float) -> Any:
+        return await self.__send(
+            lambda client: client.send_buy_command(token_mint, buy_amount), buy_amount
+        )
+
+    async def send_sell_command(self, token_mint: str, sell_percentage: int) -> Any:
+        return await self.__send(
+            lambda client: client.send_sell_command(token_mint, sell_percentage)
+        )
+
+    async def __send(
+        self, command: Callable[[ToxiBotClient], Awaitable], amount: float = 0.0
+    ) -> Any:
+        for attempt in range(len(self.accounts)):
+            account = await self.__acquire()
+            account.outstanding += 1
+            try:
+                response = await command(account.client)
+            except FloodWaitError as e:
+                account.blocked_until = time.monotonic() + e.seconds
+                logging.warning(
+                    f"Toxi account {account.client.phone_number} flood wait of {e.seconds}s"
+                )
+                if attempt == len(self.accounts) - 1:
+                    raise
+                continue
+            finally:
+                account.outstanding -= 1
+            account.allocated += amount
+            return response
+
+    async def __acquire(self) -> _Account:
+        """Pick the least busy account, waiting for short flood waits to end"""
+        while True:
+            now = time.monotonic()
+            ready = [account for account in self.accounts if account.blocked_until <= now]
+            if ready:
+                return min(ready, key=lambda account: (account.outstanding, account.allocated))
+            wait = min(account.blocked_until for account in self.accounts) - now
+            if wait > self.max_flood_wait:
+                raise RuntimeError(f"All Toxi accounts are flood waiting for {wait:.0f}s")
+            await asyncio.sleep(wait)
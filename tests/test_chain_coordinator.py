@@ -0,0 +1,130 @@
+import json
+import logging
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from src.chain_coordinator import (
+    ChainCoordinator,
+    enabled_chains,
+    merge_reports,
+    run_chain_pipeline,
+)
+from src.database import Database
+from src.models.token import Token
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    def _config_file(config):
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config))
+        return str(path)
+
+    return _config_file
+
+
+class TestChainCoordinator:
+
+    def test_enabled_chains(self):
+        """Test chain selection and the Solana default"""
+        assert enabled_chains({}) == ["solana"]
+        assert enabled_chains(
+            {"chains": {"solana": {}, "base": {"enabled": False}, "bsc": {"enabled": True}}}
+        ) == ["solana", "bsc"]
+
+    def test_merge_reports(self):
+        """Test per-chain reports are summed"""
+        report = {
+            "total_tokens": 2,
+            "status_counts": {"tier1": 1, "dead": 1},
+            "fake_volume_detected": 1,
+            "bundled_supply_count": 0,
+        }
+        merged = merge_reports({"solana": report, "base": report})
+
+        assert merged["total_tokens"] == 4
+        assert merged["status_counts"] == {"tier1": 2, "dead": 2}
+        assert merged["fake_volume_detected"] == 2
+        assert merged["chains"] == {"solana": 2, "base": 2}
+
+    def test_merged_report_reads_shards(self, tmp_path, config_file):
+        """Test the coordinator reads one database shard per chain"""
+        shards = {chain: str(tmp_path / f"{chain}.db") for chain in ("solana", "base")}
+        for chain, db_path in shards.items():
+            Database(db_path).save_token(
+                Token(address=f"{chain}-token", symbol="T", name="T", chain_id=chain,
+                      first_seen=datetime.now(), last_updated=datetime.now())
+            )
+        coordinator = ChainCoordinator(
+            config_file({"chains": {chain: {"db_path": path} for chain, path in shards.items()}})
+        )
+
+        report = coordinator.merged_report()
+        assert report["total_tokens"] == 2
+        assert report["chains"] == {"solana": 1, "base": 1}
+
+    @pytest.mark.asyncio
+    async def test_single_chain_runs_bot_directly(self, config_file):
+        """Test a single chain runs the bot in process with its own reports"""
+        coordinator = ChainCoordinator(config_file({}))
+        with patch("src.chain_coordinator.DexScreenerBot") as mock_bot:
+            mock_bot.return_value.run = AsyncMock()
+            await coordinator.run()
+
+        mock_bot.assert_called_once_with(coordinator.config_path, "solana", dry_run=False)
+        mock_bot.return_value.run.assert_awaited_once()
+
+    def test_worker_logs_to_its_own_file(self, tmp_path, monkeypatch):
+        """Test worker processes do not rotate the coordinator log"""
+        monkeypatch.chdir(tmp_path)
+        root = logging.getLogger()
+        handlers = root.handlers[:]
+        try:
+            with patch("src.chain_coordinator.DexScreenerBot"), patch(
+                "src.chain_coordinator.asyncio.run"
+            ):
+                run_chain_pipeline("config.json", "base")
+            files = [handler.baseFilename for handler in root.handlers]
+        finally:
+            for handler in root.handlers:
+                handler.close()
+            root.handlers = handlers
+
+        assert files == [str(tmp_path / "dexscreener_bot_base.log")]
+
+    @pytest.mark.asyncio
+    async def test_run_once(self, config_file):
+        """Test a single cycle of every chain runs and their stats are returned"""
+        coordinator = ChainCoordinator(
+            config_file({"chains": {"solana": {}, "base": {}}}), dry_run=True
+        )
+        with patch("src.chain_coordinator.DexScreenerBot") as mock_bot, patch.object(
+            coordinator, "send_report", AsyncMock()
+        ) as send_report:
+            mock_bot.return_value.run_once = AsyncMock(return_value="stats")
+            stats = await coordinator.run_once()
+
+        assert stats == {"solana": "stats", "base": "stats"}
+        mock_bot.assert_any_call(coordinator.config_path, "base", dry_run=True)
+        send_report.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_multi_chain_in_process(self, config_file):
+        """Test every chain gets a pipeline and a merged report is sent at the end"""
+        coordinator = ChainCoordinator(
+            config_file(
+                {
+                    "chains": {"solana": {}, "base": {}},
+                    "chain_workers": {"use_processes": False},
+                }
+            )
+        )
+        with patch("src.chain_coordinator.DexScreenerBot") as mock_bot, patch.object(
+            coordinator, "send_report", AsyncMock()
+        ):
+            mock_bot.return_value.run = AsyncMock()
+            await coordinator.run()
+
+            assert [call.args[1] for call in mock_bot.call_args_list] == ["solana", "base"]
+            assert mock_bot.return_value.send_reports is False
+            coordinator.send_report.assert_awaited_once()
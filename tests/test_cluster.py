@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import patch
+from src.cluster import (
+    ClusterBackend,
+    HashRing,
+    InstanceCluster,
+    LocalClusterBackend,
+    SqliteClusterBackend,
+)
+
+ADDRESSES = [f"token{i}" for i in range(300)]
+
+
+class TestCluster:
+
+    @pytest.fixture(params=["local", "sqlite"])
+    def backend(self, request, tmp_path):
+        if request.param == "local":
+            return LocalClusterBackend()
+        return SqliteClusterBackend(str(tmp_path / "cluster.db"))
+
+    def test_hash_ring_is_stable(self):
+        """Test adding an instance only moves the keys it takes over"""
+        before = HashRing(["a", "b"])
+        after = HashRing(["a", "b", "c"])
+
+        moved = [key for key in ADDRESSES if before.owner(key) != after.owner(key)]
+        assert all(after.owner(key) == "c" for key in moved)
+        assert 0 < len(moved) < len(ADDRESSES) / 2
+
+    def test_partition_covers_every_token_once(self, backend):
+        """Test live instances split the tokens without overlap"""
+        instances = [InstanceCluster(backend, instance_id=name) for name in ("a", "b", "c")]
+        for instance in instances:
+            instance.heartbeat()
+        for instance in instances:
+            instance.heartbeat()
+
+        owners = [sum(instance.owns(key) for instance in instances) for key in ADDRESSES]
+        assert owners == [1] * len(ADDRESSES)
+        assert all(any(instance.owns(key) for key in ADDRESSES) for instance in instances)
+
+    def test_failover_after_lease_expiry(self, backend):
+        """Test an instance whose lease expires loses its tokens"""
+        a = InstanceCluster(backend, instance_id="a", lease_ttl=60)
+        b = InstanceCluster(backend, instance_id="b", lease_ttl=60)
+        a.heartbeat()
+        b.heartbeat()
+        a.heartbeat()
+        assert not all(a.owns(key) for key in ADDRESSES)
+
+        with patch("src.cluster.time.time", return_value=10**12):
+            a.heartbeat()
+        assert all(a.owns(key) for key in ADDRESSES)
+
+    def test_leave_releases_tokens(self, backend):
+        a = InstanceCluster(backend, instance_id="a")
+        b = InstanceCluster(backend, instance_id="b")
+        a.heartbeat()
+        b.heartbeat()
+        b.leave()
+        a.heartbeat()
+        assert all(a.owns(key) for key in ADDRESSES)
+
+    def test_trade_intents_are_deduplicated(self, backend):
+        """Test only one instance may claim the same trade"""
+        a = InstanceCluster(backend, instance_id="a", intent_ttl=60)
+        b = InstanceCluster(backend, instance_id="b", intent_ttl=60)
+
+        assert a.claim_trade("token1", "buy")
+        assert not b.claim_trade("token1", "buy")
+        assert b.claim_trade("token1", "sell")
+
+        with patch("src.cluster.time.time", return_value=10**12):
+            assert b.claim_trade("token1", "buy")
+
+    def test_released_trade_can_be_claimed_again(self, backend):
+        """Test a failed trade is released, only by the instance that claimed it"""
+        a = InstanceCluster(backend, instance_id="a", intent_ttl=60)
+        b = InstanceCluster(backend, instance_id="b", intent_ttl=60)
+
+        assert a.claim_trade("token1", "buy")
+        b.release_trade("token1", "buy")
+        assert not b.claim_trade("token1", "buy")
+        a.release_trade("token1", "buy")
+        assert b.claim_trade("token1", "buy")
+
+    def test_backend_is_abstract(self):
+        with pytest.raises(TypeError):
+            ClusterBackend()
@@ -0,0 +1,112 @@
+import json
+import multiprocessing
+import os
+import pytest
+from src.config import ConfigError, ConfigWatcher, add_blacklisted, compile_rules
+from src.models.token import Token
+from src.timeseries import MomentumSignals
+
+
+@pytest.fixture
+def config():
+    return {
+        "filters": {
+            "min_liquidity": 1000,
+            "min_volume_24h": 10000,
+            "min_fdv": 30000,
+            "max_price_change_24h": 500,
+        },
+        "supply_check": {"bundled_threshold": 0.75},
+        "blacklisted_coins": ["bad_coin"],
+        "blacklisted_devs": ["bad_dev"],
+    }
+
+
+class TestConfig:
+
+    def test_compile_rules(self, config):
+        """Test compiled predicates apply the configured thresholds"""
+        rules = compile_rules(config)
+        token = Token(address="coin", symbol="C", name="Coin", liquidity=2000,
+                      volume_24h=20000, fdv=50000)
+
+        assert rules.passes_filters(token, 100)
+        assert not rules.passes_filters(token, -600)
+        assert not rules.is_blacklisted(token)
+        token.dev_address = "bad_dev"
+        assert rules.is_blacklisted(token)
+        assert rules.is_bundled(0.8) and not rules.is_bundled(0.5)
+        assert rules.supply_check.reject_freeze_authority is True
+        assert rules.fake_volume.min_unique_wallets == 10
+
+    def test_momentum_predicate(self, config):
+        """Test momentum triggers only when enabled and every signal passes"""
+        signals = MomentumSignals(
+            momentum=15, acceleration=1, volume_surge=3, observations=2, span=60
+        )
+        assert not compile_rules(config).has_momentum(signals)
+
+        config["momentum"] = {"enabled": True, "min_momentum": 10, "min_volume_surge": 2}
+        rules = compile_rules(config)
+        assert rules.has_momentum(signals)
+        assert not rules.has_momentum(
+            MomentumSignals(momentum=15, acceleration=-1, volume_surge=3, observations=2, span=60)
+        )
+
+    @pytest.mark.parametrize(
+        "section, key, value",
+        [
+            ("filters", "min_fdv", "high"),
+            ("filters", "min_fdv", -1),
+            ("supply_check", "reject_mint_authority", 1),
+            ("fake_volume_detection", "min_unique_wallets", None),
+        ],
+    )
+    def test_invalid_values(self, config, section, key, value):
+        """Test invalid thresholds are rejected"""
+        config.setdefault(section, {})[key] = value
+        with pytest.raises(ConfigError):
+            compile_rules(config)
+
+    def test_missing_section(self, config):
+        del config["filters"]["min_fdv"]
+        with pytest.raises(ConfigError):
+            compile_rules(config)
+        with pytest.raises(ConfigError):
+            compile_rules({"supply_check": {"bundled_threshold": 1}})
+
+    def test_watcher_applies_changes(self, config, tmp_path):
+        """Test the watcher reloads a changed file and skips invalid versions"""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config))
+        applied = []
+        watcher = ConfigWatcher(str(path), lambda c: applied.append(compile_rules(c)))
+
+        assert watcher.check() is False
+
+        config["filters"]["min_fdv"] = 1
+        path.write_text(json.dumps(config))
+        os.utime(path, ns=(1, 1))
+        assert watcher.check() is True
+        assert applied[-1].filters.min_fdv == 1
+
+        path.write_text("{not json")
+        assert watcher.check() is False
+        assert len(applied) == 1
+
+    def test_add_blacklisted_merges_concurrent_writers(self, config, tmp_path):
+        """Test workers adding blacklist entries keep each other's entries"""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config))
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            pool.starmap(
+                add_blacklisted,
+                [(str(path), [f"coin{i}"], [f"dev{i % 2}"]) for i in range(20)],
+            )
+
+        saved = json.loads(path.read_text())
+        assert sorted(saved["blacklisted_coins"]) == sorted(
+            ["bad_coin"] + [f"coin{i}" for i in range(20)]
+        )
+        assert sorted(saved["blacklisted_devs"]) == ["bad_dev", "dev0", "dev1"]
+        assert saved["filters"] == config["filters"]
@@ -141,3 +141,44 @@ class TestDatabase:
             )
             history_count = cursor.fetchone()[0]
             assert history_count == 2  # Should have two entries
+
+    def test_unchanged_history_is_skipped(self, db, sample_token):
+        """Test history rows are only written when a value moves or the status changes"""
+        db.save_token(sample_token)
+        db.save_token(sample_token)
+        sample_token.current_price = 50.01  # within the epsilon
+        db.save_token(sample_token)
+        sample_token.liquidity = 20000.0
+        db.save_token(sample_token)
+        sample_token.status = "dead"
+        db.save_token(sample_token)
+
+        with sqlite3.connect(db.db_path) as conn:
+            rows = conn.execute(
+                "SELECT price, liquidity, event_type FROM token_history ORDER BY id"
+            ).fetchall()
+        assert rows == [
+            (50.0, 10000.0, "normal"),
+            (50.01, 20000.0, "normal"),
+            (50.01, 20000.0, "dead"),
+        ]
+
+    def test_history_snapshot_loaded_from_database(self, test_db_path, sample_token):
+        """Test a new process compares with the last persisted history row"""
+        Database(test_db_path).save_token(sample_token)
+        db = Database(test_db_path)
+        db.save_token(sample_token)
+
+        assert db.snapshot_count == 1
+        with sqlite3.connect(db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM token_history").fetchone()[0] == 1
+
+    def test_history_keyframe(self, test_db_path, sample_token):
+        """Test an unchanged token still gets a row every keyframe interval"""
+        db = Database(test_db_path, keyframe_interval=0)
+        db.save_token(sample_token)
+        db.save_token(sample_token)
+
+        assert db.trim_snapshots(0) == 1
+        with sqlite3.connect(db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM token_history").fetchone()[0] == 2
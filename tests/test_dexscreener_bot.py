@@ -1,12 +1,24 @@
 import pytest
 import asyncio
 import json
+import sqlite3
+import subprocess
+import sys
 import pytest_asyncio
 import aiohttp
 from aioresponses import aioresponses
+from telethon.tl.custom.message import Message
+from telethon.tl.types import PeerUser
+from yarl import URL
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
-from src.dexscreener_bot import DexScreenerBot
+from src.cluster import InstanceCluster, LocalClusterBackend
+from src.database import Database
+from src.dexscreener_bot import DexScreenerBot, RugcheckUnavailable
+from src.json_decoder import DISCOVERY_FIELDS
 from src.models.token import Token
+from src.pool_listener import PoolListener
+from src.position_ledger import PositionLedger
+from src.toxi_client_pool import ToxiClientPool
 
 
 @pytest.fixture
@@ -72,6 +84,51 @@ class TestDexScreenerBot:
             assert isinstance(data, list)
             assert data[0]["baseToken"]["address"] == "0x123456"
 
+    @pytest.mark.asyncio
+    async def test_fetch_token_data_uses_deepest_pool(self, bot):
+        url = f"{bot.dexscreener_url}/tokens/v1/solana/0xabc"
+        pairs = [
+            {
+                "pairAddress": pair_address,
+                "dexId": dex_id,
+                "baseToken": {"address": base_token},
+                "liquidity": {"usd": liquidity},
+            }
+            for pair_address, dex_id, base_token, liquidity in [
+                ("p1", "pumpfun", "0xabc", 800),
+                ("p2", "raydium", "0xabc", 250000),
+                ("p3", "orca", "0xother", 900000),  # quoted in the token
+            ]
+        ]
+        with aioresponses() as m:
+            m.get(url, payload=pairs)
+            data = await bot._DexScreenerBot__fetch_token_data("0xabc")
+
+        assert data["pairAddress"] == "p2"
+        assert len(bot.pair_index.pairs("0xabc")) == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_api_data_conditional_cache(self, bot):
+        endpoint = "token-boosts/top/v1"
+        url = f"{bot.dexscreener_url}/{endpoint}"
+        body = [{"tokenAddress": "test_token", "chainId": "solana"}]
+        decode = AsyncMock(side_effect=bot.decoder.decode)
+        bot.decoder.decode = decode
+        with aioresponses() as m:
+            m.get(url, payload=body, headers={"ETag": '"v1"'})
+            m.get(url, status=304)
+            m.get(url, payload=body)  # no validators, same body
+            results = [
+                await bot._DexScreenerBot__fetch_api_data(endpoint, DISCOVERY_FIELDS, cache=True)
+                for _ in range(3)
+            ]
+            requests = m.requests[("GET", URL(url))]
+
+        assert results == [body] * 3
+        decode.assert_awaited_once()
+        assert "If-None-Match" not in requests[0].kwargs["headers"]
+        assert requests[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
     @pytest.mark.asyncio
     async def test_get_dynamic_token_list(self, bot):
         with patch.object(
@@ -85,6 +142,80 @@ class TestDexScreenerBot:
             assert isinstance(tokens, list)
             assert "test_token" in tokens
 
+    @pytest.mark.asyncio
+    async def test_get_dynamic_token_list_filters_chain(self, bot):
+        bot.chain_id = "base"
+        with patch.object(
+            bot,
+            "_DexScreenerBot__fetch_api_data",
+            AsyncMock(
+                return_value=[
+                    {"tokenAddress": "sol_token", "chainId": "solana"},
+                    {"tokenAddress": "base_token", "chainId": "base"},
+                ]
+            ),
+        ):
+            tokens = await bot._DexScreenerBot__get_dynamic_token_list()
+            assert tokens == ["base_token"]
+
+    @pytest.mark.asyncio
+    async def test_trade_without_client(self, bot, mock_token):
+        bot.client = None
+        result = await bot._DexScreenerBot__trade_with_toxi_bot(mock_token, "buy", 0.1)
+        assert result is False
+
+    def test_toxi_accounts_build_a_pool(self, mock_config):
+        accounts = [
+            {
+                "telegram_api_id": str(i),
+                "telegram_api_hash": "xxxxxxxxx",
+                "telegram_phone_number": f"+01121212121{i}",
+            }
+            for i in range(2)
+        ]
+        mock_config["toxi_bot_settings"]["accounts"] = accounts
+        with patch(
+            "src.dexscreener_bot.DexScreenerBot._DexScreenerBot__load_config",
+            return_value=mock_config,
+        ), patch("telegram.Bot"):
+            bot = DexScreenerBot()
+
+        assert isinstance(bot.client, ToxiClientPool)
+        assert [a.client.phone_number for a in bot.client.accounts] == [
+            "+011212121210",
+            "+011212121211",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_trade_deduplicated_in_cluster(self, bot, mock_token):
+        bot.client = AsyncMock()
+        bot.client.send_buy_command.return_value = {}
+        bot.cluster = InstanceCluster(LocalClusterBackend(), instance_id="a")
+
+        assert await bot._DexScreenerBot__trade_with_toxi_bot(mock_token, "buy", 0.1)
+        assert not await bot._DexScreenerBot__trade_with_toxi_bot(mock_token, "buy", 0.1)
+        bot.client.send_buy_command.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unsent_trade_releases_cluster_claim(self, bot, mock_token):
+        bot.client = AsyncMock()
+        bot.client.send_buy_command.side_effect = [RuntimeError("flood wait"), {}]
+        bot.cluster = InstanceCluster(LocalClusterBackend(), instance_id="a")
+
+        assert not await bot._DexScreenerBot__trade_with_toxi_bot(mock_token, "buy", 0.1)
+        assert await bot._DexScreenerBot__trade_with_toxi_bot(mock_token, "buy", 0.1)
+        assert bot.client.send_buy_command.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sent_trade_keeps_cluster_claim(self, bot, mock_token):
+        bot.client = AsyncMock()
+        bot.client.send_buy_command.return_value = {"errors": ["slippage"]}
+        bot.cluster = InstanceCluster(LocalClusterBackend(), instance_id="a")
+        other = InstanceCluster(bot.cluster.backend, instance_id="b")
+
+        assert not await bot._DexScreenerBot__trade_with_toxi_bot(mock_token, "buy", 0.1)
+        assert not other.claim_trade(mock_token.address, "buy")
+
     @pytest.mark.asyncio
     async def test_verify_rugcheck(self, bot, mock_token, load_json):
         url = f"{bot.rugcheck_url}/{mock_token.address}/report/summary"
@@ -117,6 +248,94 @@ class TestDexScreenerBot:
             assert result is False
             assert mock_token.rugcheck_status == "rug"
 
+    @pytest.mark.asyncio
+    async def test_verify_rugcheck_uses_prefetch(self, bot, mock_token, load_json):
+        url = f"{bot.rugcheck_url}/{mock_token.address}/report/summary"
+        with aioresponses() as m:
+            m.get(url, payload=load_json("tests/etc/rugcheck/bad.json"))
+            bot._DexScreenerBot__prefetch_rugcheck([mock_token.address])
+            await asyncio.sleep(0.01)
+            # The mocked URL answers once, the verification reuses the prefetch
+            assert not await bot._DexScreenerBot__verify_rugcheck(mock_token)
+
+        assert mock_token.rugcheck_status == "rug"
+        assert bot._rugcheck_prefetch == {}
+
+    @pytest.mark.asyncio
+    async def test_process_tokens_cancels_unused_rugcheck(self, bot):
+        bot.request_delay = 0
+        cancelled = []
+
+        async def hang(token_address):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(token_address)
+                raise
+
+        async def fetch(token_address):
+            await asyncio.sleep(0)  # the lookup starts meanwhile
+            return None
+
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["unlisted_token"]),
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_token_data", AsyncMock(side_effect=fetch)
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock(side_effect=hang)
+        ), patch.object(bot.database, "generate_report", return_value={}):
+            await bot._DexScreenerBot__process_tokens()
+            await asyncio.sleep(0)
+
+        assert cancelled == ["unlisted_token"]
+        assert bot._rugcheck_prefetch == {}
+
+    @pytest.mark.asyncio
+    async def test_rugcheck_prefetch_looks_ahead(self, bot):
+        bot.request_delay = 0
+        bot.rugcheck_concurrency = 2
+        in_flight = []
+
+        async def fetch(token_address):
+            in_flight.append(sorted(bot._rugcheck_prefetch))
+            return None
+
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["a", "b", "c", "d"]),
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_token_data", AsyncMock(side_effect=fetch)
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock(return_value={})
+        ), patch.object(
+            bot, "_DexScreenerBot__select_tokens", side_effect=lambda tokens: tokens
+        ), patch.object(bot.database, "generate_report", return_value={}):
+            await bot._DexScreenerBot__process_tokens()
+
+        assert in_flight == [["a", "b"], ["b", "c"], ["c", "d"], ["d"]]
+
+    @pytest.mark.asyncio
+    async def test_rugcheck_error_is_not_blacklisted(self, bot, mock_token, tmp_path):
+        bot.config_path = str(tmp_path / "config.json")
+        token_data = {
+            "baseToken": {"address": "token", "symbol": "T", "name": "Token"},
+            "chainId": "solana",
+            "priceUsd": "1",
+            "priceChange": {"h24": 10},
+            "volume": {"h24": 50000},
+            "info": {"websites": [{"url": "https://t"}], "socials": [{"url": "https://x"}]},
+        }
+        with patch.object(
+            bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock(side_effect=aiohttp.ClientError)
+        ), pytest.raises(RugcheckUnavailable):
+            await bot._DexScreenerBot__analyze_and_trade(token_data)
+
+        assert bot.rules.blacklisted_coins == set()
+        assert bot.config["blacklisted_coins"] == []
+
     @pytest.mark.asyncio
     async def test_process_tokens(self, bot):
         with patch.object(
@@ -143,12 +362,431 @@ class TestDexScreenerBot:
             bot._DexScreenerBot__fetch_token_data.assert_called_once()
             bot._DexScreenerBot__analyze_and_trade.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_process_tokens_skips_recently_rejected(self, bot, tmp_path):
+        from src.seen_filter import RotatingBloomFilter
+
+        bot.rejected = RotatingBloomFilter(capacity=100)
+        bot.rejected_path = str(tmp_path / "rejected.bloom")
+        bot.request_delay = 0
+        fetch = AsyncMock(return_value={"priceChange": {"h24": 1}})
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["bad_token"]),
+        ), patch.object(bot, "_DexScreenerBot__fetch_token_data", fetch), patch.object(
+            bot, "_DexScreenerBot__analyze_and_trade", AsyncMock(return_value=None)
+        ):
+            await bot._DexScreenerBot__process_tokens()
+            await bot._DexScreenerBot__process_tokens()
+
+        fetch.assert_awaited_once_with("bad_token")
+        assert "bad_token" in bot.rejected
+        assert (tmp_path / "rejected.bloom").exists()
+
+    @pytest.mark.asyncio
+    async def test_rugcheck_error_is_not_remembered_as_rejected(self, bot, tmp_path):
+        from src.seen_filter import RotatingBloomFilter
+
+        bot.rejected = RotatingBloomFilter(capacity=100)
+        bot.rejected_path = str(tmp_path / "rejected.bloom")
+        bot.request_delay = 0
+        analyze = AsyncMock(side_effect=RugcheckUnavailable("Rugcheck API error: 429"))
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["token"]),
+        ), patch.object(
+            bot,
+            "_DexScreenerBot__fetch_token_data",
+            AsyncMock(return_value={"priceChange": {"h24": 1}}),
+        ), patch.object(bot, "_DexScreenerBot__analyze_and_trade", analyze), patch.object(
+            bot.database, "generate_report", return_value={}
+        ):
+            await bot._DexScreenerBot__process_tokens()
+            await bot._DexScreenerBot__process_tokens()
+
+        assert analyze.await_count == 2
+        assert "token" not in bot.rejected
+        assert (bot.last_cycle.rejected, bot.last_cycle.errors) == (0, 1)
+
+    @pytest.mark.asyncio
+    async def test_process_tokens_merges_new_pools(self, bot):
+        bot.request_delay = 0
+        bot.pool_listener = PoolListener("ws://localhost:8900")
+        bot.pool_listener.push("new_pool_token", "pump.fun")
+        fetch = AsyncMock(return_value={"priceChange": {"h24": 1}})
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["listed_token"]),
+        ), patch.object(bot, "_DexScreenerBot__fetch_token_data", fetch), patch.object(
+            bot, "_DexScreenerBot__analyze_and_trade", AsyncMock(return_value=None)
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock(return_value={})
+        ), patch.object(bot.database, "generate_report", return_value={}):
+            await bot._DexScreenerBot__process_tokens()
+
+        assert [c.args[0] for c in fetch.await_args_list] == ["new_pool_token", "listed_token"]
+        assert bot.pool_listener.pending() == []
+
+    @pytest.mark.asyncio
+    async def test_pools_created_during_cycle_jump_the_queue(self, bot):
+        bot.request_delay = 0
+        bot.pool_listener = PoolListener("ws://localhost:8900")
+
+        async def fetch(token_address):
+            if token_address == "first_token":
+                bot.pool_listener.push("new_pool_token", "pump.fun")
+            return {"priceChange": {"h24": 1}}
+
+        fetch = AsyncMock(side_effect=fetch)
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["first_token", "second_token"]),
+        ), patch.object(bot, "_DexScreenerBot__fetch_token_data", fetch), patch.object(
+            bot, "_DexScreenerBot__analyze_and_trade", AsyncMock(return_value=None)
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock(return_value={})
+        ), patch.object(
+            bot, "_DexScreenerBot__select_tokens", side_effect=lambda tokens: tokens
+        ), patch.object(bot.database, "generate_report", return_value={}):
+            await bot._DexScreenerBot__process_tokens()
+
+        assert [c.args[0] for c in fetch.await_args_list] == [
+            "first_token",
+            "new_pool_token",
+            "second_token",
+        ]
+        assert bot.last_cycle.selected == 3
+
+    @pytest.mark.asyncio
+    async def test_new_pools_per_cycle_are_capped(self, bot):
+        bot.request_delay = 0
+        bot.new_pools_per_cycle = 3
+        bot.pool_listener = PoolListener("ws://localhost:8900")
+        launched = iter(range(1000))
+
+        async def fetch(token_address):
+            # A pool launched before every fetch
+            bot.pool_listener.push(f"pool_{next(launched)}", "pump.fun")
+            return {"priceChange": {"h24": 1}}
+
+        fetch = AsyncMock(side_effect=fetch)
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["a", "b"]),
+        ), patch.object(bot, "_DexScreenerBot__fetch_token_data", fetch), patch.object(
+            bot, "_DexScreenerBot__analyze_and_trade", AsyncMock(return_value=None)
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock(return_value={})
+        ), patch.object(
+            bot, "_DexScreenerBot__select_tokens", side_effect=lambda tokens: tokens
+        ), patch.object(bot.database, "generate_report", return_value={}):
+            await bot._DexScreenerBot__process_tokens()
+
+        assert [c.args[0] for c in fetch.await_args_list] == [
+            "a", "pool_0", "pool_1", "pool_2", "b"
+        ]
+        assert bot.pool_listener.pending() == [f"pool_{i}" for i in range(3, 5)]
+
     @pytest.mark.asyncio
     async def test_send_telegram_notification(self, bot, mocker):
         await bot.send_telegram_notification("Test message")
         bot.telegram_bot.send_message.assert_called_once()
         assert bot.telegram_bot.send_message.call_args[1]["text"] == "Test message"
 
+    def test_check_authorities(self, bot, mock_token):
+        assert not bot._DexScreenerBot__check_authorities(mock_token)
+        mock_token.freeze_authority = "Freeze111"
+        assert bot._DexScreenerBot__check_authorities(mock_token)
+        config = json.loads(json.dumps(bot.config))
+        config["supply_check"]["reject_freeze_authority"] = False
+        bot.apply_config(config)
+        assert not bot._DexScreenerBot__check_authorities(mock_token)
+
+    def test_check_bundled_supply_prefers_onchain_ratio(self, bot, mock_token):
+        mock_token.liquidity = 900
+        mock_token.fdv = 1000
+        assert not bot._DexScreenerBot__check_bundled_supply(mock_token)
+        mock_token.top_holders_ratio = 0.95
+        assert bot._DexScreenerBot__check_bundled_supply(mock_token)
+        assert mock_token.supply_bundled is True
+
+    @pytest.mark.asyncio
+    async def test_analyze_buys_on_momentum(self, bot, mock_config):
+        token_data = {
+            "baseToken": {"address": "momentum_token", "symbol": "MOM", "name": "Momentum"},
+            "chainId": "solana",
+            "priceUsd": "1.5",
+            "priceChange": {"m5": 20, "h1": 12, "h24": 30},
+            "volume": {"m5": 5000, "h1": 12000, "h24": 50000},
+            "liquidity": {"usd": 200000},
+            "fdv": 600000,
+            "info": {"websites": [{"url": "https://mom"}], "socials": [{"url": "https://x"}]},
+        }
+        mock_config["momentum"] = {"enabled": True}
+        bot.apply_config(mock_config)
+
+        with patch.object(
+            bot, "_DexScreenerBot__verify_rugcheck", AsyncMock(return_value=True)
+        ), patch.object(
+            bot, "_DexScreenerBot__trade_with_toxi_bot", AsyncMock(return_value=True)
+        ) as trade:
+            token = await bot._DexScreenerBot__analyze_and_trade(token_data)
+            await bot._DexScreenerBot__drain_trades()
+
+        assert token.status == "momentum"
+        trade.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_non_solana_token_skips_rugcheck(self, mock_config, tmp_path):
+        mock_config["chains"] = {"base": {"db_path": str(tmp_path / "base.db")}}
+        with patch(
+            "src.dexscreener_bot.DexScreenerBot._DexScreenerBot__load_config",
+            return_value=mock_config,
+        ), patch("telegram.Bot"):
+            bot = DexScreenerBot(chain_id="base")
+        token_data = {
+            "baseToken": {"address": "0xBase", "symbol": "BASE", "name": "Base"},
+            "chainId": "base",
+            "priceUsd": "1.5",
+            "priceChange": {"h24": 30},
+            "volume": {"h24": 50000},
+            "liquidity": {"usd": 200000},
+            "fdv": 600000,
+            "info": {"websites": [{"url": "https://base"}], "socials": [{"url": "https://x"}]},
+        }
+
+        with patch.object(bot, "_DexScreenerBot__fetch_rugcheck", AsyncMock()) as rugcheck:
+            token = await bot._DexScreenerBot__analyze_and_trade(token_data)
+
+        rugcheck.assert_not_awaited()
+        assert token.status == "dead"
+        assert token.rugcheck_status == "unknown"
+        assert bot.rules.blacklisted_coins == set()
+
+    @pytest.mark.asyncio
+    async def test_buy_respects_position_limits(self, bot, mock_token, tmp_path):
+        bot.positions = PositionLedger(Database(str(tmp_path / "test.db")), 0.2, 600)
+        with patch.object(
+            bot, "_DexScreenerBot__trade_with_toxi_bot", AsyncMock(return_value=True)
+        ) as trade:
+            assert await bot._DexScreenerBot__buy(mock_token)
+            assert not await bot._DexScreenerBot__buy(mock_token)
+
+        trade.assert_awaited_once()
+        assert bot.positions.get(mock_token.address).size == pytest.approx(0.1)
+
+    @pytest.mark.asyncio
+    async def test_background_buy_error_is_logged(self, bot, mock_token, caplog):
+        bot.client = AsyncMock()
+        bot.cluster = MagicMock()
+        bot.cluster.claim_trade.side_effect = sqlite3.OperationalError("database is locked")
+
+        bot._DexScreenerBot__fan_out_buy(mock_token)
+        await bot._DexScreenerBot__drain_trades()
+
+        assert not bot._trades
+        assert f"Buy of {mock_token.address} failed" in caplog.text
+        assert "database is locked" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_buy_records_position_of_sent_message(self, bot, mock_token, tmp_path):
+        bot.positions = PositionLedger(Database(str(tmp_path / "test.db")), 0.1, 600)
+        bot.client = AsyncMock()
+        bot.client.send_buy_command.return_value = Message(
+            id=1, peer_id=PeerUser(1), message=f"/buy {mock_token.address} 0.1"
+        )
+
+        assert await bot._DexScreenerBot__buy(mock_token)
+        assert not await bot._DexScreenerBot__buy(mock_token)
+        bot.client.send_buy_command.assert_awaited_once()
+        assert bot.positions.get(mock_token.address).size == pytest.approx(0.1)
+
+    @pytest.mark.asyncio
+    async def test_dry_run_once(self, mock_config, mock_token):
+        with patch(
+            "src.dexscreener_bot.DexScreenerBot._DexScreenerBot__load_config",
+            return_value=mock_config,
+        ):
+            bot = DexScreenerBot(dry_run=True)
+        assert bot.telegram_bot is None
+        bot.request_delay = 0
+
+        async def analyze(token_data):
+            mock_token.status = "tier1"
+            await bot._DexScreenerBot__buy(mock_token)
+            return mock_token
+
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=[mock_token.address]),
+        ), patch.object(
+            bot, "_DexScreenerBot__fetch_token_data", AsyncMock(return_value={"pair": 1})
+        ), patch.object(
+            bot, "_DexScreenerBot__analyze_and_trade", AsyncMock(side_effect=analyze)
+        ), patch.object(bot.database, "save_token"), patch.object(
+            bot.database, "generate_report", return_value={}
+        ), patch.object(bot.positions, "flush") as flush:
+            stats = await bot.run_once(install_signal_handlers=False)
+
+        assert (stats.discovered, stats.processed, stats.trades) == (1, 1, 1)
+        assert stats.intended_trades[0]["token"] == mock_token.address
+        assert stats.intended_trades[0]["amount"] == 0.1
+        flush.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dry_run_leaves_shared_state_untouched(self, mock_config, mock_token, tmp_path):
+        db_path = str(tmp_path / "data.db")
+        bloom_path = tmp_path / "rejected.bloom"
+        config_path = tmp_path / "config.json"
+        mock_config["chains"] = {"solana": {"db_path": db_path}}
+        mock_config["cluster"] = {"enabled": True}
+        mock_config["rejected_filter"] = {"enabled": True, "path": str(bloom_path)}
+        config_path.write_text(json.dumps(mock_config))
+        bot = DexScreenerBot(str(config_path), dry_run=True)
+        bot.request_delay = 0
+
+        async def analyze(token_data):
+            if token_data["pair"] == "rug":
+                bot._DexScreenerBot__update_blacklists(Token(address="rug", symbol="R", name="R"))
+                return None
+            mock_token.status = "tier1"
+            await bot._DexScreenerBot__buy(mock_token)
+            return mock_token
+
+        with patch.object(
+            bot,
+            "_DexScreenerBot__get_dynamic_token_list",
+            AsyncMock(return_value=["rug", mock_token.address]),
+        ), patch.object(
+            bot,
+            "_DexScreenerBot__fetch_token_data",
+            AsyncMock(side_effect=lambda address: {"pair": address}),
+        ), patch.object(
+            bot, "_DexScreenerBot__analyze_and_trade", AsyncMock(side_effect=analyze)
+        ), patch.object(bot.database, "generate_report", return_value={}):
+            stats = await bot.run_once(install_signal_handlers=False)
+
+        assert (stats.rejected, stats.trades) == (1, 1)
+        assert json.loads(config_path.read_text()) == mock_config
+        assert not bloom_path.exists()
+        with sqlite3.connect(db_path) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            assert "trade_intent" not in tables and "cluster_instance" not in tables
+            assert conn.execute("SELECT COUNT(*) FROM token").fetchone() == (0,)
+
+    def test_apply_config_swaps_rules(self, bot, mock_token):
+        mock_token.liquidity = 6000
+        mock_token.volume_24h = 20000
+        mock_token.fdv = 200000
+        assert bot._DexScreenerBot__apply_filters(mock_token, 10)
+
+        config = json.loads(json.dumps(bot.config))
+        config["filters"]["min_liquidity"] = 10000
+        config["blacklisted_coins"] = [mock_token.address]
+        bot.apply_config(config)
+
+        assert not bot._DexScreenerBot__apply_filters(mock_token, 10)
+        assert bot._DexScreenerBot__check_blacklists(mock_token)
+        assert bot.config is config
+
+    def test_apply_config_arms_profiler(self, bot, mock_config):
+        assert not bot.profiler.active
+        config = json.loads(json.dumps(mock_config))
+        config["profiling"] = {"enabled": True}
+        bot.apply_config(config)
+        assert bot.profiler.active
+
+    def test_apply_invalid_config_keeps_rules(self, bot):
+        rules = bot.rules
+        config = json.loads(json.dumps(bot.config))
+        config["filters"]["min_liquidity"] = "a lot"
+        with pytest.raises(ValueError):
+            bot.apply_config(config)
+        assert bot.rules is rules
+
+    def test_update_blacklists(self, bot, mock_token, tmp_path):
+        bot.config_path = str(tmp_path / "config.json")
+        with open(bot.config_path, "w") as f:
+            json.dump({**bot.config, "blacklisted_devs": ["dev0"]}, f)  # from another worker
+        mock_token.dev_address = "dev1"
+        bot._DexScreenerBot__update_blacklists(mock_token)
+
+        assert bot._DexScreenerBot__check_blacklists(mock_token)
+        with open(bot.config_path) as f:
+            saved = json.load(f)
+        assert saved["blacklisted_devs"] == ["dev0", "dev1"]
+
+    def test_memory_budget_keeps_blacklists(self, bot, mock_config, mock_token):
+        mock_config["blacklisted_coins"] = ["a", "b", mock_token.address]
+        bot.apply_config(mock_config)
+        bot.memory = bot._DexScreenerBot__build_memory_budget(
+            {"caps": {"blacklisted_coins": 1}}
+        )
+
+        assert bot.memory.enforce() == {}
+        assert bot._DexScreenerBot__check_blacklists(mock_token)
+        assert bot.memory.usage()["blacklisted_coins"] == {"entries": 3, "cap": 1}
+        assert bot.memory.usage()["blacklisted_devs"] == {"entries": 0, "cap": None}
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_pending_tasks(self, bot):
+        bot.client = AsyncMock()
+        task = asyncio.create_task(asyncio.sleep(60))
+        bot._tasks.add(task)
+
+        await bot.stop()
+
+        assert task.cancelled()
+        assert bot.running is False
+        bot.client.stop.assert_awaited_once()
+        bot.telegram_bot.send_message.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stop_respects_deadline(self, bot):
+        async def hang():
+            await asyncio.sleep(60)
+
+        bot.client = AsyncMock()
+        bot.client.stop.side_effect = hang
+        bot.shutdown_timeout = 0.05
+
+        await asyncio.wait_for(bot.stop(), timeout=1)
+        assert bot.running is False
+        bot.telegram_bot.send_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_positions_when_drain_times_out(self, bot, tmp_path):
+        database = Database(str(tmp_path / "test.db"))
+        bot.positions = PositionLedger(database, 0.1, 600)
+        bot.positions.record_buy("bought", 1.0, 0.1)
+        bot._trades.add(asyncio.create_task(asyncio.sleep(60)))  # stuck in a flood wait
+        bot.shutdown_timeout = 0.05
+
+        await asyncio.wait_for(bot.stop(), timeout=1)
+
+        saved = PositionLedger(database, 0.1, 600)
+        saved.load()
+        assert saved.get("bought").size == pytest.approx(0.1)
+        for task in bot._trades:
+            task.cancel()
+
+    def test_module_import_is_lazy(self):
+        code = (
+            "import sys, src.dexscreener_bot; "
+            "print(sorted(m for m in ('telegram', 'telethon', 'solana', 'requests') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "[]"
+
     def test_load_config_valid_file(self, mock_config):
         with patch("builtins.open", mock_open(read_data=json.dumps(mock_config))):
             with patch("json.load", return_value=mock_config):
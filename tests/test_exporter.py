@@ -0,0 +1,105 @@
+import sqlite3
+import pytest
+from src.database import Database
+from src.exporter import TableExporter
+from src.models.token import Token
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "data.db")
+    Database(path)
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO token_history (token_address, timestamp, price, volume, liquidity, "
+            "event_type) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                ("a", "2025-01-01T10:00:00.000001", 1.0, 10.0, 100.0, "normal"),
+                ("b", "2025-01-01T23:59:59", 2.0, 20.0, 200.0, "tier1"),
+                ("a", "2025-01-02T00:00:01", 1.5, 15.0, 150.0, "pumped"),
+            ],
+        )
+        conn.execute(
+            "INSERT INTO token (token_address, symbol, first_seen, last_updated, "
+            "fake_volume_detected, supply_bundled) VALUES (?, ?, ?, ?, ?, ?)",
+            ("a", "A", "2025-01-01T10:00:00", "2025-01-02T00:00:01", 1, 0),
+        )
+    return path
+
+
+def read_dataset(path, fmt):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(path, format="ipc" if fmt == "arrow" else fmt, partitioning="hive").to_table()
+
+
+class TestTableExporter:
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_export_partitions_by_day(self, db_path, tmp_path, fmt):
+        """Test rows are streamed into one partition per day"""
+        out = tmp_path / "export"
+        stats = TableExporter(db_path, str(out), fmt, chunk_size=1).export("token_history")
+
+        assert stats.rows == 3
+        assert stats.files == 2
+        assert sorted(p.name for p in (out / "token_history").iterdir()) == [
+            "date=2025-01-01",
+            "date=2025-01-02",
+        ]
+        table = read_dataset(str(out / "token_history"), fmt)
+        assert table.num_rows == 3
+        assert table.schema.field("timestamp").type == pa.timestamp("us")
+
+    def test_incremental_export(self, db_path, tmp_path):
+        """Test a second export only writes rows after the high-water mark"""
+        out = str(tmp_path / "export")
+        exporter = TableExporter(db_path, out)
+        assert exporter.export("token_history").high_water_mark == 3
+        assert exporter.export("token_history").rows == 0
+
+        with sqlite3.connect(db_path) as conn:
+            # Same timestamp as the last exported row
+            conn.execute(
+                "INSERT INTO token_history (token_address, timestamp, price) VALUES (?, ?, ?)",
+                ("c", "2025-01-02T00:00:01", 3.0),
+            )
+        stats = exporter.export("token_history")
+        assert stats.rows == 1
+        assert read_dataset(out + "/token_history", "parquet").num_rows == 4
+
+    def test_incremental_export_of_saved_tokens(self, tmp_path):
+        """Test tokens inserted or updated after an export are in the next one"""
+        path = str(tmp_path / "data.db")
+        database = Database(path)
+        exporter = TableExporter(path, str(tmp_path / "export"))
+        database.save_token(Token(address="a", symbol="A", name="A"))
+        assert exporter.export("token").rows == 1
+
+        database.save_token(Token(address="a", symbol="A", name="A", current_price=2.0))
+        database.save_token(Token(address="b", symbol="B", name="B"))
+        assert exporter.export("token").rows == 2
+        assert exporter.export("token").rows == 0
+
+    def test_timestamp_mark_from_previous_version(self, db_path, tmp_path):
+        """Test a history mark saved as a timestamp still exports only newer rows"""
+        out = tmp_path / "export"
+        out.mkdir()
+        (out / "_export_state.json").write_text('{"token_history": "2025-01-01T23:59:59"}')
+
+        stats = TableExporter(db_path, str(out)).export("token_history")
+        assert stats.rows == 1
+        assert stats.high_water_mark == 3
+
+    def test_export_token_table(self, db_path, tmp_path):
+        stats = TableExporter(db_path, str(tmp_path / "export")).export("token", since="")
+        table = read_dataset(str(tmp_path / "export" / "token"), "parquet")
+
+        assert stats.rows == 1
+        assert table.column("fake_volume_detected").to_pylist() == [True]
+
+    def test_unknown_format(self, db_path, tmp_path):
+        with pytest.raises(ValueError):
+            TableExporter(db_path, str(tmp_path), "csv")
@@ -0,0 +1,92 @@
+import pytest
+from src.fake_volume_detector import FakeVolumeDetector
+
+
+def pair_snapshot(buys, sells, volume):
+    return {
+        "txns": {tf: {"buys": buys, "sells": sells} for tf in ("m5", "h1", "h6")},
+        "volume": {"m5": volume, "h1": volume * 12, "h6": volume * 72},
+    }
+
+
+class TestFakeVolumeDetector:
+
+    @pytest.fixture
+    def detector(self):
+        return FakeVolumeDetector(
+            repetitive_trade_threshold=0.9,
+            min_unique_wallets=10,
+            max_trade_size_variation=0.1,
+            window=5,
+            min_samples=3,
+        )
+
+    def test_wash_trading_detected(self, detector):
+        """Test mirrored, uniform trades from few wallets are flagged"""
+        for i in range(3):
+            detector.update("wash", pair_snapshot(4, 4, 800), timestamp=i * 300)
+
+        signals = detector.signals("wash")
+        assert signals == {
+            "repetitive_trades": True,
+            "few_wallets": True,
+            "uniform_trade_size": True,
+        }
+        assert detector.is_suspicious("wash")
+
+    def test_organic_trading_not_flagged(self, detector):
+        """Test varied, buy-heavy activity is not flagged"""
+        for buys, sells, volume in [(50, 10, 5000), (80, 30, 20000), (40, 20, 3000)]:
+            detector.update("organic", pair_snapshot(buys, sells, volume))
+
+        assert not detector.is_suspicious("organic")
+
+    def test_unchanged_snapshots_recorded_once(self, detector):
+        """Test cycles shorter than the m5 window do not repeat the same snapshot"""
+        for i in range(3):
+            detector.update("active", pair_snapshot(40, 38, 8000), timestamp=i * 60)
+
+        assert len(detector._tokens["active"].trade_size) == 1
+        assert not detector.is_suspicious("active")
+
+    def test_balanced_organic_series_not_flagged(self, detector):
+        """Test an active token with balanced buys and sells is not flagged"""
+        series = [(40, 38, 8000), (52, 47, 6100), (35, 33, 9400), (61, 55, 7200)]
+        for i, (buys, sells, volume) in enumerate(series):
+            detector.update("active", pair_snapshot(buys, sells, volume), timestamp=i * 300)
+
+        assert detector.signals("active")["repetitive_trades"]
+        assert not detector.is_suspicious("active")
+
+    def test_needs_min_samples(self, detector):
+        """Test no verdict before enough cycles are observed"""
+        detector.update("new", pair_snapshot(4, 4, 800))
+        assert detector.signals("new") == {}
+        assert not detector.is_suspicious("new")
+
+    def test_memory_is_bounded(self):
+        """Test tracked tokens are capped and buffers have a fixed size"""
+        detector = FakeVolumeDetector(window=3, max_tokens=2)
+        for address in ["a", "b", "c"]:
+            for i in range(10):
+                detector.update(address, pair_snapshot(1, 1, 10), timestamp=i * 300)
+
+        assert len(detector) == 2
+        assert detector.signals("a") == {}
+        activity = detector._tokens["c"]
+        assert len(activity.trade_size) == activity.trade_size.size == 3
+
+    def test_trim(self, detector):
+        """Test trimming forgets the least recently updated tokens"""
+        for address in ["a", "b", "c"]:
+            detector.update(address, pair_snapshot(1, 1, 10))
+
+        assert detector.trim(2) == 1
+        assert detector.signals("a") == {}
+        assert len(detector) == 2
+
+    def test_missing_txns(self, detector):
+        """Test payloads without txns are tolerated"""
+        for _ in range(3):
+            detector.update("bare", {"volume": {"h24": 10}})
+        assert not detector.is_suspicious("bare")
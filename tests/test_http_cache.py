@@ -0,0 +1,29 @@
+from src.http_cache import HttpCache
+
+URL = "https://api.dexscreener.com/token-boosts/top/v1"
+
+
+class TestHttpCache:
+
+    def test_validators(self):
+        """Test conditional headers come from the stored response"""
+        cache = HttpCache()
+        assert cache.validators(URL) == {}
+
+        headers = {"ETag": '"v1"', "Last-Modified": "Mon, 19 Oct 2026 10:00:00 GMT"}
+        cache.store(URL, headers, b"[]", [])
+        assert cache.validators(URL) == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 19 Oct 2026 10:00:00 GMT",
+        }
+
+    def test_unchanged_body(self):
+        """Test an identical body returns the cached data and refreshes validators"""
+        cache = HttpCache()
+        data = [{"tokenAddress": "a"}]
+        cache.store(URL, {}, b'[{"tokenAddress": "a"}]', data)
+
+        assert cache.unchanged(URL, {"ETag": '"v2"'}, b'[{"tokenAddress": "a"}]') is data
+        assert cache.validators(URL) == {"If-None-Match": '"v2"'}
+        assert cache.unchanged(URL, {}, b'[{"tokenAddress": "b"}]') is None
+        assert cache.unchanged("https://other", {}, b"[]") is None
@@ -0,0 +1,59 @@
+import json
+import threading
+import pytest
+from src.json_decoder import JsonDecoder, project, DISCOVERY_FIELDS, PAIR_FIELDS
+from src.models.token import Token
+
+
+class TestJsonDecoder:
+
+    def test_project_nested_fields(self):
+        """Test projection keeps only the requested keys"""
+        data = {"a": 1, "b": {"c": 2, "d": 3}, "e": [1, 2]}
+        assert project(data, {"a": None, "b": {"c": None}}) == {"a": 1, "b": {"c": 2}}
+
+    def test_project_list_and_missing_keys(self):
+        """Test projection applies per item and ignores missing keys"""
+        data = [{"chainId": "solana", "tokenAddress": "abc", "icon": "x"}, {"url": "y"}]
+        assert project(data, DISCOVERY_FIELDS) == [
+            {"chainId": "solana", "tokenAddress": "abc"},
+            {},
+        ]
+
+    def test_projected_pair_is_parsable(self, load_json):
+        """Test the pair projection keeps everything Token.parse needs"""
+        decoder = JsonDecoder()
+        raw = json.dumps(load_json("tests/etc/fetch_api_data.json")).encode()
+        pairs = decoder.loads(raw, PAIR_FIELDS)
+
+        token = Token.parse(pairs[0])
+        assert token.address == "0x123456"
+        assert pairs[0]["priceChange"]["h24"] == 1
+
+    @pytest.mark.parametrize("backend", ["json", "auto"])
+    def test_backends(self, backend):
+        """Test both backends decode the same payload"""
+        decoder = JsonDecoder(backend=backend)
+        assert decoder.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_unknown_backend(self):
+        """Test an unknown backend is rejected"""
+        with pytest.raises(ValueError):
+            JsonDecoder(backend="yaml")
+
+    @pytest.mark.asyncio
+    async def test_large_payload_offloaded(self):
+        """Test payloads above the threshold are decoded in a worker thread"""
+        decoder = JsonDecoder(backend="json", offload_threshold=10)
+        threads = []
+
+        def loads(raw):
+            threads.append(threading.current_thread())
+            return json.loads(raw)
+
+        decoder._loads = loads
+        await decoder.decode(b"[1]")
+        await decoder.decode(b'{"key": "a long value"}')
+
+        assert threads[0] is threading.main_thread()
+        assert threads[1] is not threading.main_thread()
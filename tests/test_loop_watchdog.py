@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from src.loop_watchdog import LoopWatchdog
+
+
+def block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+class TestLoopWatchdog:
+    @pytest.mark.asyncio
+    async def test_measures_lag(self):
+        watchdog = LoopWatchdog(interval=0.01, threshold=1)
+        task = asyncio.create_task(watchdog.watch())
+        await asyncio.sleep(0.05)
+        block_the_loop(0.1)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        stats = watchdog.stats()
+        assert stats["max_ms"] >= 80
+        assert stats["mean_ms"] <= stats["max_ms"]
+        assert stats["stalls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_logs_blocking_stack(self, caplog):
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.05)
+        task = asyncio.create_task(watchdog.watch())
+        await asyncio.sleep(0.05)
+        with caplog.at_level(logging.WARNING):
+            block_the_loop(0.3)
+            await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert watchdog.stalls == 1
+        assert "Event loop blocked" in caplog.text
+        assert "block_the_loop" in caplog.text
+
+    def test_stats_before_start(self):
+        assert LoopWatchdog().stats() == {
+            "last_ms": 0.0,
+            "mean_ms": 0.0,
+            "max_ms": 0.0,
+            "stalls": 0,
+        }
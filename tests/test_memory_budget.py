@@ -0,0 +1,33 @@
+from src.memory_budget import MemoryBudget
+
+
+class TestMemoryBudget:
+    def test_enforce_trims_over_cap(self):
+        cache = list(range(10))
+
+        def trim(max_entries):
+            evicted = len(cache) - max_entries
+            del cache[:evicted]
+            return evicted
+
+        budget = MemoryBudget()
+        budget.register("cache", cache.__len__, trim, cap=4)
+
+        assert budget.enforce() == {"cache": 6}
+        assert cache == [6, 7, 8, 9]
+        assert budget.enforce() == {}
+
+    def test_configured_cap_wins(self):
+        cache = list(range(10))
+        budget = MemoryBudget({"cache": 8})
+        budget.register("cache", cache.__len__, lambda n: cache.clear() or 10, cap=4)
+        budget.register("index", lambda: 3)
+
+        assert budget.usage() == {
+            "cache": {"entries": 10, "cap": 8},
+            "index": {"entries": 3, "cap": None},
+        }
+        assert budget.enforce() == {"cache": 10}
+
+    def test_rss_bytes(self):
+        assert MemoryBudget.rss_bytes() > 0
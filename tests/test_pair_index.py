@@ -0,0 +1,83 @@
+import pytest
+from src.pair_index import PairIndex
+
+
+def pair(address, dex_id, liquidity, price, volume_h24, buys=10, change_h24=0):
+    return {
+        "pairAddress": address,
+        "dexId": dex_id,
+        "baseToken": {"address": "token"},
+        "priceUsd": str(price),
+        "priceChange": {"h24": change_h24},
+        "txns": {"h24": {"buys": buys, "sells": 5}},
+        "volume": {"h24": volume_h24},
+        "liquidity": {"usd": liquidity},
+        "fdv": 1000000,
+    }
+
+
+class TestPairIndex:
+
+    def test_best_is_deepest_pool(self):
+        """Test the deepest pool wins whatever the listing order"""
+        index = PairIndex()
+        index.update(
+            "token",
+            [pair("thin", "pumpfun", 500, 2.0, 10), pair("deep", "raydium", 90000, 1.0, 5000)],
+        )
+
+        assert index.best("token")["pairAddress"] == "deep"
+        assert index.best("unknown") is None
+
+    def test_update_refreshes_pools(self):
+        """Test a fetch updates pools by pair address"""
+        index = PairIndex()
+        index.update("token", [pair("a", "raydium", 1000, 1.0, 10)])
+        index.update(
+            "token", [pair("b", "orca", 5000, 1.0, 10), pair("a", "raydium", 9000, 1.0, 10)]
+        )
+
+        assert len(index.pairs("token")) == 2
+        assert index.best("token")["pairAddress"] == "a"
+
+    def test_pool_missing_from_fetch_is_dropped(self):
+        """Test a vanished deep pool no longer wins with stale liquidity"""
+        index = PairIndex()
+        index.update(
+            "token",
+            [pair("deep", "raydium", 500000, 1.0, 10), pair("thin", "pumpfun", 500, 2.0, 10)],
+        )
+        index.update("token", [pair("thin", "pumpfun", 500, 2.0, 10)])
+
+        assert index.best("token")["pairAddress"] == "thin"
+        assert [p["pairAddress"] for p in index.pairs("token")] == ["thin"]
+
+    def test_aggregate_weights_by_liquidity(self):
+        """Test volumes and txns are summed and prices weighted by liquidity"""
+        index = PairIndex()
+        index.update(
+            "token",
+            [
+                pair("a", "raydium", 3000, 1.0, 100, buys=10, change_h24=10),
+                pair("b", "orca", 1000, 2.0, 50, buys=4, change_h24=50),
+            ],
+        )
+        aggregated = index.aggregate("token")
+
+        assert aggregated["dexId"] == "raydium"
+        assert aggregated["liquidity"]["usd"] == 4000
+        assert aggregated["priceUsd"] == pytest.approx(1.25)
+        assert aggregated["priceChange"]["h24"] == pytest.approx(20)
+        assert aggregated["volume"]["h24"] == 150
+        assert aggregated["txns"]["h24"] == {"buys": 14, "sells": 10}
+
+    def test_memory_is_bounded(self):
+        """Test tracked tokens are capped, least recently updated first"""
+        index = PairIndex(max_tokens=2)
+        for token in ["a", "b", "c"]:
+            index.update(token, [pair(token, "raydium", 1000, 1.0, 10)])
+
+        assert len(index) == 2
+        assert index.pairs("a") == []
+        assert index.trim(1) == 1
+        assert index.pairs("c")
@@ -0,0 +1,200 @@
+import asyncio
+import base64
+import struct
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from solders.pubkey import Pubkey
+
+from src.pool_listener import (
+    PUMP_CREATE_EVENT,
+    PUMP_FUN,
+    RAYDIUM_AMM_V4,
+    PoolListener,
+    decode_pump_create_event,
+    raydium_pool_mints,
+)
+
+WSOL = "So11111111111111111111111111111111111111112"
+PUMP_MINT = Pubkey.new_unique()
+RAYDIUM_MINT = str(Pubkey.new_unique())
+
+
+def borsh_string(value: str) -> bytes:
+    data = value.encode()
+    return struct.pack("<I", len(data)) + data
+
+
+def create_event(mint: Pubkey = PUMP_MINT) -> bytes:
+    return (
+        PUMP_CREATE_EVENT
+        + borsh_string("Pump Token")  # noqa: W503
+        + borsh_string("PUMP")  # noqa: W503
+        + borsh_string("https://ipfs.io/ipfs/pump")  # noqa: W503
+        + bytes(mint)  # noqa: W503
+        + bytes(Pubkey.new_unique())  # noqa: W503
+        + bytes(Pubkey.new_unique())  # noqa: W503
+    )
+
+
+def initialize2_transaction(coin_mint: str, pc_mint: str) -> dict:
+    accounts = [str(Pubkey.new_unique()) for _ in range(8)] + [coin_mint, pc_mint]
+    accounts += [str(Pubkey.new_unique()) for _ in range(11)]
+    return {
+        "transaction": {
+            "message": {"instructions": [{"programId": RAYDIUM_AMM_V4, "accounts": accounts}]}
+        },
+        "meta": {"innerInstructions": []},
+    }
+
+
+def notification(subscription: int, logs, err=None, signature="sig") -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "subscription": subscription,
+            "result": {"value": {"signature": signature, "err": err, "logs": logs}},
+        },
+    }
+
+
+def rpc_app(requests) -> web.Application:
+    """Solana RPC mock: log subscriptions over websocket, getTransaction over HTTP"""
+
+    async def websocket(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscriptions = {}
+        for _ in range(2):
+            message = await ws.receive_json()
+            requests.append(message)
+            subscriptions[message["params"][0]["mentions"][0]] = 100 + message["id"]
+            await ws.send_json(
+                {"jsonrpc": "2.0", "result": 100 + message["id"], "id": message["id"]}
+            )
+
+        pump = subscriptions[PUMP_FUN]
+        raydium = subscriptions[RAYDIUM_AMM_V4]
+        event = base64.b64encode(create_event()).decode()
+        await ws.send_json(
+            notification(pump, ["Program log: Instruction: Buy", "Program data: AAAAAAAAAAA="])
+        )
+        await ws.send_json(
+            notification(pump, ["Program log: Instruction: Create", f"Program data: {event}"])
+        )
+        await ws.send_json(notification(pump, [f"Program data: {event}"], err={"custom": 1}))
+        await ws.send_json(
+            notification(raydium, ["Program log: initialize2: InitializeInstruction2"])
+        )
+        await ws.receive()  # hold the connection until the client leaves
+        return ws
+
+    async def rpc(request):
+        batch = await request.json()
+        requests.extend(batch)
+        return web.json_response(
+            [
+                {
+                    "jsonrpc": "2.0",
+                    "id": call["id"],
+                    "result": initialize2_transaction(RAYDIUM_MINT, WSOL),
+                }
+                for call in batch
+            ]
+        )
+
+    app = web.Application()
+    app.router.add_get("/", websocket)
+    app.router.add_post("/", rpc)
+    return app
+
+
+class TestPoolListener:
+    def test_decode_pump_create_event(self):
+        event = decode_pump_create_event(create_event())
+
+        assert event["name"] == "Pump Token"
+        assert event["symbol"] == "PUMP"
+        assert event["uri"] == "https://ipfs.io/ipfs/pump"
+        assert event["mint"] == str(PUMP_MINT)
+
+    def test_decode_rejects_other_and_truncated_events(self):
+        assert decode_pump_create_event(b"\x00" * 200) is None
+        assert decode_pump_create_event(create_event()[:-40]) is None
+        assert decode_pump_create_event(PUMP_CREATE_EVENT + b"\xff\xff\xff\xff") is None
+
+    def test_raydium_pool_mints_skip_quote_mint(self):
+        assert raydium_pool_mints(initialize2_transaction(WSOL, RAYDIUM_MINT)) == [RAYDIUM_MINT]
+        assert raydium_pool_mints(None) == []
+
+    def test_pending_until_resolved_or_out_of_attempts(self):
+        listener = PoolListener("ws://localhost:8900", max_attempts=2)
+        listener.push("a", "pump.fun")
+        listener.push("b", "pump.fun")
+        listener.push("a", "pump.fun")
+
+        assert listener.pending() == ["a", "b"]
+        listener.resolve("a")
+        assert listener.pending() == ["b"]
+        assert listener.pending() == []
+        assert len(listener) == 2
+
+    def test_fresh_hands_out_new_mints_once(self):
+        listener = PoolListener("ws://localhost:8900", max_attempts=3)
+        listener.push("a", "pump.fun")
+        assert listener.pending() == ["a"]
+        listener.push("b", "raydium")
+
+        assert listener.fresh() == ["b"]
+        assert listener.fresh() == []
+        assert listener.pending() == ["a", "b"]
+
+    def test_fresh_limit_and_pending_cap(self):
+        listener = PoolListener("ws://localhost:8900", max_pending=3)
+        for mint in "abcd":
+            listener.push(mint, "pump.fun")
+
+        assert listener.pending_count == 3
+        assert listener.fresh(limit=2) == ["b", "c"]
+        assert listener.trim_pending(1) == 2
+        assert listener.pending() == ["d"]
+
+    @pytest.mark.asyncio
+    async def test_listen_survives_unexpected_errors(self, caplog):
+        listener = PoolListener("ws://localhost:8900", reconnect_delay=0)
+        attempts = AsyncMock(side_effect=[KeyError("value"), asyncio.CancelledError()])
+        with patch.object(listener, "_PoolListener__listen_once", attempts):
+            with pytest.raises(asyncio.CancelledError):
+                await listener.listen()
+        await listener.close()
+
+        assert attempts.await_count == 2
+        assert "Pool listener failure" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_listen_against_mock_server(self):
+        requests = []
+        server = TestServer(rpc_app(requests))
+        await server.start_server()
+        url = str(server.make_url("/"))
+        listener = PoolListener(url.replace("http", "ws", 1), rpc_url=url)
+        task = asyncio.create_task(listener.listen())
+        try:
+            for _ in range(100):
+                if len(listener) == 2:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await listener.close()
+            await server.close()
+
+        assert listener.pending() == [str(PUMP_MINT), RAYDIUM_MINT]
+        subscribed = [r["params"][0]["mentions"][0] for r in requests[:2]]
+        assert sorted(subscribed) == sorted([PUMP_FUN, RAYDIUM_AMM_V4])
+        assert requests[2]["method"] == "getTransaction"
+        assert requests[2]["params"][0] == "sig"
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database import Database
+from src.position_ledger import PositionLedger
+
+
+class TestPositionLedger:
+    @pytest.fixture
+    def db(self, tmp_path):
+        return Database(str(tmp_path / "test.db"))
+
+    @pytest.fixture
+    def ledger(self, db):
+        ledger = PositionLedger(db, max_exposure=0.2, cooldown=600)
+        ledger.load()
+        return ledger
+
+    def test_exposure_limit(self, ledger):
+        assert ledger.can_buy("0x123", 0.1)
+        assert not ledger.can_buy("0x123", 0.3)
+
+        ledger.record_buy("0x123", 1.0, 0.2)
+        ledger.get("0x123").last_buy_at -= timedelta(hours=1)
+        assert not ledger.can_buy("0x123", 0.1)
+
+    def test_cooldown(self, ledger):
+        ledger.record_buy("0x123", 1.0, 0.1)
+        assert not ledger.can_buy("0x123", 0.1)
+
+        ledger.get("0x123").last_buy_at = datetime.now() - timedelta(seconds=601)
+        assert ledger.can_buy("0x123", 0.1)
+
+    def test_average_entry_price(self, ledger):
+        ledger.record_buy("0x123", 1.0, 0.1)
+        ledger.record_buy("0x123", 4.0, 0.05)
+
+        position = ledger.get("0x123")
+        assert position.entry_price == pytest.approx(2.0)
+        assert position.size == pytest.approx(0.15)
+        assert position.buys == 2
+
+    def test_closed_position_reopens(self, ledger):
+        ledger.record_buy("0x123", 1.0, 0.2)
+        ledger.close("0x123")
+        assert ledger.can_buy("0x123", 0.1)
+
+        ledger.record_buy("0x123", 2.0, 0.1)
+        assert ledger.get("0x123").state == "open"
+        assert ledger.get("0x123").entry_price == 2.0
+
+    def test_flush_is_write_behind(self, db, ledger):
+        ledger.record_buy("0x123", 1.0, 0.1)
+        assert db.load_positions() == []
+
+        ledger.flush()
+        reloaded = PositionLedger(db, max_exposure=0.2, cooldown=600)
+        reloaded.load()
+        assert len(reloaded) == 1
+        position = reloaded.get("0x123")
+        assert position.size == pytest.approx(0.1)
+        assert position.state == "open"
+        assert not reloaded.can_buy("0x123", 0.1)
+
+    def test_trim_keeps_open_and_unsaved_positions(self, ledger):
+        for address in ["a", "b", "c", "d"]:
+            ledger.record_buy(address, 1.0, 0.1)
+        ledger.close("a")
+        ledger.close("b")
+        ledger.flush()
+        ledger.close("c")
+
+        assert ledger.trim(1) == 2
+        assert ledger.get("a") is None and ledger.get("b") is None
+        assert ledger.get("c").state == "closed"
+        assert ledger.get("d").state == "open"
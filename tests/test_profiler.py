@@ -0,0 +1,49 @@
+import asyncio
+import tracemalloc
+import pytest
+from src.profiler import CycleProfiler
+
+
+async def fake_cycle():
+    data = [str(i) for i in range(1000)]
+    await asyncio.sleep(0)
+    return len(data)
+
+
+class TestCycleProfiler:
+
+    def test_inactive_by_default(self, tmp_path):
+        profiler = CycleProfiler(str(tmp_path))
+        assert not profiler.active
+        profiler.arm(2)
+        assert profiler.active and profiler.remaining == 2
+
+    @pytest.mark.asyncio
+    async def test_profile_writes_reports(self, tmp_path, caplog):
+        """Test each profiled cycle writes pstats and tracemalloc files"""
+        caplog.set_level("INFO")
+        profiler = CycleProfiler(str(tmp_path), cycles=2, top=5)
+        profiler.arm()
+
+        assert await profiler.profile(fake_cycle()) == 1000
+        assert tracemalloc.is_tracing()
+        assert await profiler.profile(fake_cycle()) == 1000
+
+        assert not profiler.active
+        assert not tracemalloc.is_tracing()
+        files = sorted(p.suffix for p in tmp_path.iterdir())
+        assert files == [".pstats", ".pstats", ".tracemalloc", ".tracemalloc"]
+        assert "fake_cycle" in caplog.text
+        assert "Top allocation sites" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_profile_reports_failed_cycle(self, tmp_path):
+        """Test a failing cycle is still reported and the error propagates"""
+        async def failing():
+            raise RuntimeError("boom")
+
+        profiler = CycleProfiler(str(tmp_path), cycles=1)
+        profiler.arm()
+        with pytest.raises(RuntimeError):
+            await profiler.profile(failing())
+        assert len(list(tmp_path.glob("*.pstats"))) == 1
@@ -0,0 +1,42 @@
+import statistics
+import pytest
+from src.rolling_window import RollingWindow
+
+
+class TestRollingWindow:
+
+    def test_push_and_stats(self):
+        """Test running statistics match a full recomputation"""
+        window = RollingWindow(4)
+        values = [1.0, 2.0, 3.0, 4.0, 10.0, 6.0]
+        for value in values:
+            window.push(value)
+
+        kept = values[-4:]
+        assert len(window) == 4
+        assert window.total == pytest.approx(sum(kept))
+        assert window.mean == pytest.approx(statistics.fmean(kept))
+        assert window.std == pytest.approx(statistics.pstdev(kept))
+        assert window.last == 6.0
+
+    def test_ago(self):
+        """Test reading older values relative to the last push"""
+        window = RollingWindow(3)
+        for value in [1.0, 2.0, 3.0, 4.0]:
+            window.push(value)
+
+        assert window.ago(0) == 4.0
+        assert window.ago(2) == 2.0
+        with pytest.raises(IndexError):
+            window.ago(3)
+
+    def test_empty_window(self):
+        """Test statistics of an empty window"""
+        window = RollingWindow(2)
+        assert window.mean == 0.0
+        assert window.variance == 0.0
+        assert window.coefficient_of_variation == 0.0
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            RollingWindow(0)
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import patch
+from src.seen_filter import BloomFilter, RotatingBloomFilter
+
+
+class TestSeenFilter:
+
+    def test_bloom_filter_membership(self):
+        """Test added keys are found and the false positive rate stays close to target"""
+        num_bits, num_hashes = BloomFilter.optimal_size(1000, 0.01)
+        bloom = BloomFilter(num_bits, num_hashes)
+        for i in range(1000):
+            bloom.add(f"token{i}")
+
+        assert all(f"token{i}" in bloom for i in range(1000))
+        false_positives = sum(f"other{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_rotation_forgets_old_keys(self):
+        """Test keys expire after the configured number of windows"""
+        with patch("src.seen_filter.time.time", return_value=1000.0) as clock:
+            seen = RotatingBloomFilter(capacity=100, window=60, generations=2)
+            seen.add("old")
+
+            clock.return_value = 1070.0
+            assert "old" in seen
+            seen.add("new")
+
+            clock.return_value = 1130.0
+            assert "old" not in seen
+            assert "new" in seen
+
+            clock.return_value = 5000.0
+            assert "new" not in seen
+
+    def test_memory_cap(self):
+        """Test max_bytes bounds the filter size"""
+        seen = RotatingBloomFilter(capacity=1000000, error_rate=0.0001, max_bytes=4096)
+        assert seen.size_bytes <= 4096
+        assert seen.false_positive_rate(1000000) > 0.0001
+
+    def test_save_and_load(self, tmp_path):
+        """Test the filter survives a restart"""
+        path = str(tmp_path / "rejected.bloom")
+        seen = RotatingBloomFilter(capacity=100)
+        seen.add("token")
+        seen.save(path)
+
+        restored = RotatingBloomFilter(capacity=100)
+        assert restored.load(path)
+        assert "token" in restored
+        assert restored.rotated_at == seen.rotated_at
+
+    @pytest.mark.parametrize("content", [b"", b"garbage" * 10])
+    def test_load_invalid_file(self, tmp_path, content):
+        path = tmp_path / "rejected.bloom"
+        path.write_bytes(content)
+        assert not RotatingBloomFilter(capacity=100).load(str(path))
+
+    def test_load_with_changed_settings(self, tmp_path):
+        path = str(tmp_path / "rejected.bloom")
+        RotatingBloomFilter(capacity=100).save(path)
+        assert not RotatingBloomFilter(capacity=5000).load(path)
+        assert not RotatingBloomFilter(capacity=100).load(str(tmp_path / "missing"))
@@ -0,0 +1,185 @@
+import base64
+import struct
+import time
+import pytest
+from aioresponses import aioresponses, CallbackResult
+from solders.pubkey import Pubkey
+from src.models.onchain_info import OnChainInfo
+from src.solana_rpc import POOL_AUTHORITIES, PUMP_FUN, SolanaRpcClient
+
+RPC_URL = "http://localhost:8899"
+MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+CREATOR = "So11111111111111111111111111111111111111112"
+LAUNCHPAD = "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM"
+
+
+def metadata(update_authority: str = LAUNCHPAD, creators=((PUMP_FUN, 0), (CREATOR, 1))) -> bytes:
+    """Metaplex metadata account data with padded strings and (address, verified) creators"""
+    data = bytes([4]) + bytes(Pubkey.from_string(update_authority)) + bytes(32)
+    for size in (32, 10, 200):
+        data += struct.pack("<I", size) + b"x" * size
+    data += struct.pack("<H", 0)
+    if creators is None:
+        return data + bytes([0])
+    data += bytes([1]) + struct.pack("<I", len(creators))
+    for address, verified in creators:
+        data += bytes(Pubkey.from_string(address)) + bytes([verified, 100 // len(creators)])
+    return data
+
+
+def bonding_curve(mint: str) -> str:
+    seeds = [b"bonding-curve", bytes(Pubkey.from_string(mint))]
+    return str(Pubkey.find_program_address(seeds, Pubkey.from_string(PUMP_FUN))[0])
+
+
+def rpc_server(requests_seen, largest=None, owners=None, metadata_data=None):
+    """Build an aioresponses callback answering Solana JSON-RPC batches"""
+    largest = largest or [("Holder0", "500"), ("Holder1", "200"), ("Holder2", "100")]
+    owners = owners or {}
+    metadata_data = metadata_data or metadata()
+
+    def handle(url, **kwargs):
+        batch = kwargs["json"]
+        requests_seen.append(batch)
+        replies = []
+        for call in batch:
+            encoding = call["params"][1]["encoding"] if len(call["params"]) > 1 else None
+            if call["method"] == "getMultipleAccounts" and call["params"][0][0].startswith(
+                "Holder"
+            ):
+                value = [
+                    {"data": {"parsed": {"info": {"owner": owners.get(address, address)}}}}
+                    for address in call["params"][0]
+                ]
+            elif call["method"] == "getMultipleAccounts" and encoding == "jsonParsed":
+                value = [
+                    {
+                        "data": {
+                            "parsed": {
+                                "info": {
+                                    "mintAuthority": None,
+                                    "freezeAuthority": "Freeze111",
+                                    "supply": "1000",
+                                }
+                            }
+                        }
+                    }
+                    for _ in call["params"][0]
+                ]
+            elif call["method"] == "getMultipleAccounts":
+                value = [
+                    {"data": [base64.b64encode(metadata_data).decode(), "base64"]}
+                    for _ in call["params"][0]
+                ]
+            else:
+                value = [{"address": address, "amount": amount} for address, amount in largest]
+            replies.append({"jsonrpc": "2.0", "id": call["id"], "result": {"value": value}})
+        return CallbackResult(payload=replies)
+
+    return handle
+
+
+class TestSolanaRpcClient:
+
+    @pytest.mark.asyncio
+    async def test_prefetch_enriches_mints(self):
+        """Test authorities, creator and holder ratio are read from one batch"""
+        client = SolanaRpcClient(RPC_URL, top_holders=2)
+        seen = []
+        with aioresponses() as m:
+            m.post(RPC_URL, callback=rpc_server(seen), repeat=True)
+            await client.prefetch([MINT])
+        await client.close()
+
+        info = client.get(MINT)
+        assert len(seen) == 2
+        assert [call["method"] for call in seen[0]] == [
+            "getMultipleAccounts",
+            "getMultipleAccounts",
+            "getTokenLargestAccounts",
+        ]
+        assert seen[1][0]["params"][0] == ["Holder0", "Holder1", "Holder2"]
+        assert info.mint_authority is None
+        assert info.freeze_authority == "Freeze111"
+        assert info.creator == CREATOR
+        assert info.top_holders_ratio == 0.7
+
+    @pytest.mark.asyncio
+    async def test_prefetch_uses_cache_and_batches(self):
+        """Test cached mints are not refetched and chunks follow batch_size"""
+        client = SolanaRpcClient(RPC_URL, batch_size=1)
+        seen = []
+        with aioresponses() as m:
+            m.post(RPC_URL, callback=rpc_server(seen), repeat=True)
+            await client.prefetch([MINT, CREATOR, "not-a-mint"])
+            await client.prefetch([MINT, CREATOR])
+        await client.close()
+
+        assert len(seen) == 4  # holders and their owners for each chunk of one mint
+        assert client.get("not-a-mint") is None
+
+    @pytest.mark.asyncio
+    async def test_pool_accounts_are_not_holders(self):
+        """Test bonding curve, AMM vaults and pair accounts are left out of the ratio"""
+        client = SolanaRpcClient(RPC_URL)
+        largest = [("HolderCurve", "760"), ("HolderVault", "100"), ("HolderPool", "50")]
+        largest += [("Holder0", "40"), ("Holder1", "10")]
+        owners = {
+            "HolderCurve": bonding_curve(MINT),
+            "HolderVault": next(iter(POOL_AUTHORITIES)),
+            "HolderPool": "PairAddress",
+        }
+        with aioresponses() as m:
+            m.post(RPC_URL, callback=rpc_server([], largest, owners), repeat=True)
+            await client.prefetch([MINT])
+        await client.close()
+
+        info = client.get(MINT)
+        assert info.top_holders_ratio == 0.1
+        assert client.holders_ratio(info, {"PairAddress"}) == 0.05
+
+    @pytest.mark.asyncio
+    async def test_creator_needs_verified_creator(self):
+        """Test the shared update authority is never reported as the developer"""
+        for data in (metadata(CREATOR, creators=((CREATOR, 0),)), metadata(creators=None)):
+            client = SolanaRpcClient(RPC_URL)
+            with aioresponses() as m:
+                m.post(RPC_URL, callback=rpc_server([], metadata_data=data), repeat=True)
+                await client.prefetch([MINT])
+            await client.close()
+
+            assert client.get(MINT).creator is None
+
+    @pytest.mark.asyncio
+    async def test_ignored_creators(self):
+        """Test launchpad authorities are not reported as developers"""
+        client = SolanaRpcClient(RPC_URL, ignored_creators=[CREATOR])
+        with aioresponses() as m:
+            m.post(RPC_URL, callback=rpc_server([]), repeat=True)
+            await client.prefetch([MINT])
+        await client.close()
+
+        assert client.get(MINT).creator is None
+
+    @pytest.mark.asyncio
+    async def test_rpc_error_is_logged(self, caplog):
+        """Test an RPC failure leaves the cache empty without raising"""
+        client = SolanaRpcClient(RPC_URL)
+        with aioresponses() as m:
+            m.post(RPC_URL, status=500)
+            await client.prefetch([MINT])
+        await client.close()
+
+        assert client.get(MINT) is None
+        assert "Solana RPC error" in caplog.text
+
+    def test_trim_drops_expired_then_oldest(self):
+        """Test the cache is trimmed of expired entries first"""
+        client = SolanaRpcClient(RPC_URL, cache_ttl=60)
+        now = time.monotonic()
+        for mint, age in [("expired", 120), ("old", 30), ("new", 1), ("newer", 0)]:
+            client._cache[mint] = OnChainInfo(mint=mint, fetched_at=now - age)
+
+        assert client.trim(10) == 1
+        assert client.trim(2) == 1
+        assert sorted(client._cache) == ["new", "newer"]
@@ -0,0 +1,62 @@
+import pytest
+from src.timeseries import TimeSeriesStore
+
+
+def snapshot(price, volume_m5=100.0, m5=0.0, h1=0.0, volume_h1=1200.0):
+    return {
+        "priceUsd": str(price),
+        "priceChange": {"m5": m5, "h1": h1, "h24": 0},
+        "volume": {"m5": volume_m5, "h1": volume_h1, "h24": volume_h1 * 24},
+    }
+
+
+class TestTimeSeriesStore:
+
+    def test_first_observation_uses_payload(self):
+        """Test a new token gets signals from its m5/h1 fields"""
+        store = TimeSeriesStore()
+        signals = store.record("token", snapshot(1.0, volume_m5=400, m5=12, h1=24))
+
+        assert signals.observations == 1
+        assert signals.momentum == 12
+        assert signals.acceleration == 10
+        assert signals.volume_surge == 4
+
+    def test_momentum_and_acceleration_from_history(self):
+        """Test signals follow the observed price series"""
+        store = TimeSeriesStore(lookback=2)
+        for t, price in enumerate([1.0, 1.0, 1.1, 1.32]):
+            signals = store.record("token", snapshot(price), timestamp=t * 60)
+
+        assert signals.momentum == pytest.approx(32)
+        assert signals.acceleration == pytest.approx(32 - 10)
+        assert signals.span == 120
+        assert signals.observations == 4
+
+    def test_volume_surge_against_rolling_mean(self):
+        store = TimeSeriesStore(capacity=4)
+        for volume in [100, 100, 100, 500]:
+            signals = store.record("token", snapshot(1.0, volume_m5=volume))
+
+        assert signals.volume_surge == pytest.approx(500 / 200)
+
+    def test_memory_is_bounded(self):
+        """Test buffers stay at capacity and tokens are capped"""
+        store = TimeSeriesStore(capacity=3, max_tokens=2)
+        for address in ["a", "b", "c"]:
+            for price in range(1, 10):
+                store.record(address, snapshot(price))
+
+        assert len(store) == 2
+        assert "a" not in store._series
+        assert len(store._series["c"].price) == 3
+
+    def test_trim(self):
+        """Test trimming forgets the least recently updated tokens"""
+        store = TimeSeriesStore()
+        for address in ["a", "b", "c"]:
+            store.record(address, snapshot(1))
+        store.record("a", snapshot(2))
+
+        assert store.trim(1) == 2
+        assert list(store._series) == ["a"]
@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telethon.errors import FloodWaitError
+
+from src.toxi_client_pool import ToxiClientPool
+
+
+def make_client(phone_number):
+    client = MagicMock(phone_number=phone_number)
+    client.send_buy_command = AsyncMock(return_value={"account": phone_number})
+    client.send_sell_command = AsyncMock(return_value={"account": phone_number})
+    return client
+
+
+@pytest.mark.asyncio
+class TestToxiClientPool:
+    async def test_balances_allocation(self):
+        a, b = make_client("a"), make_client("b")
+        pool = ToxiClientPool([a, b])
+
+        responses = [await pool.send_buy_command(f"TOKEN{i}", 0.1) for i in range(4)]
+
+        assert [r["account"] for r in responses] == ["a", "b", "a", "b"]
+
+    async def test_least_outstanding(self):
+        a, b = make_client("a"), make_client("b")
+        release = asyncio.Event()
+
+        async def slow_buy(token_mint, buy_amount):
+            await release.wait()
+            return {"account": "a"}
+
+        a.send_buy_command.side_effect = slow_buy
+        pool = ToxiClientPool([a, b])
+
+        first = asyncio.create_task(pool.send_buy_command("TOKEN1", 0.1))
+        await asyncio.sleep(0)
+        second = await pool.send_sell_command("TOKEN2", 50)
+        release.set()
+
+        assert second["account"] == "b"
+        assert (await first)["account"] == "a"
+
+    async def test_flood_wait_moves_to_other_account(self):
+        a, b = make_client("a"), make_client("b")
+        a.send_buy_command.side_effect = FloodWaitError(request=None, capture=60)
+        pool = ToxiClientPool([a, b])
+
+        assert (await pool.send_buy_command("TOKEN1", 0.1))["account"] == "b"
+        assert (await pool.send_buy_command("TOKEN2", 0.1))["account"] == "b"
+        a.send_buy_command.assert_awaited_once()
+
+    async def test_all_accounts_flood_waiting(self):
+        a, b = make_client("a"), make_client("b")
+        for client in (a, b):
+            client.send_buy_command.side_effect = FloodWaitError(request=None, capture=60)
+        pool = ToxiClientPool([a, b], max_flood_wait=30)
+
+        with pytest.raises(FloodWaitError):
+            await pool.send_buy_command("TOKEN1", 0.1)
+        with pytest.raises(RuntimeError):
+            await pool.send_buy_command("TOKEN2", 0.1)
+
+    async def test_connect_and_stop_every_account(self):
+        clients = [make_client("a"), make_client("b")]
+        for client in clients:
+            client.setup, client.connect, client.stop = AsyncMock(), AsyncMock(), AsyncMock()
+        pool = ToxiClientPool(clients)
+
+        await pool.setup()
+        await pool.connect()
+        await pool.stop()
+
+        for client in clients:
+            client.setup.assert_awaited_once()
+            client.connect.assert_awaited_once()
+            client.stop.assert_awaited_once()